@@ -10,6 +10,7 @@ circuit. See :ref:`protocol-pairs` for the exact protocols.
 
 from Compiler.types import MemValue, read_mem_value, regint, Array, cint
 from Compiler.types import _bitint, _number, _fix, _structure, _bit, _vec, sint, sintbit
+from Compiler.types import _block_cache
 from Compiler.types import vectorized_classmethod
 from Compiler.program import Tape, Program
 from Compiler.exceptions import *
@@ -59,6 +60,10 @@ class bits(Tape.Register, _structure, _bit):
             res.load_other(other)
             return res
     hard_conv = conv
+    def link(self, other):
+        super(bits, self).link(other)
+        # as in Compiler.types._register.link
+        _block_cache.invalidate(self.duplicates)
     @classmethod
     def compose(cls, items, bit_length=1):
         return cls.bit_compose(sum([util.bit_decompose(item, bit_length) for item in items], []))
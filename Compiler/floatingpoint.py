@@ -157,6 +157,29 @@ def PreOpL(op, items):
                     output[y+z] = op(output[y], output[y+z], j != 0)
     return output
 
+def PreOpL_vec(op, items):
+    """
+    Vectorized version of :py:func:`PreOpL` for registers of equal
+    size, with one operation per level.
+    """
+    k = len(items)
+    logk = int(ceil(log(k,2)))
+    kmax = 2**logk
+    size = items[0].size
+    output = list(items)
+    for i in range(logk):
+        pairs = []
+        for j in range(kmax//(2**(i+1))):
+            y = two_power(i) + j*two_power(i+1) - 1
+            for z in range(1, 2**i+1):
+                if y+z < k:
+                    pairs.append((y, y+z))
+        res = op(type(items[0]).concat(output[y] for y, _ in pairs),
+                 type(items[0]).concat(output[x] for _, x in pairs))
+        for n, (_, x) in enumerate(pairs):
+            output[x] = res.get_vector(n * size, size)
+    return output
+
 def PreOpL2(op, items):
     """
     Uses algorithm from SecureSCM WP9 deliverable.
@@ -223,6 +246,9 @@ def PreOpN(op, items):
 def PreOR(a=None, raw=False):
     if comparison.const_rounds:
         return PreORC(a, raw=raw)
+    elif len(a) > 2 and isinstance(getattr(a[0], 'size', None), int) and \
+         all(isinstance(x, types.sint) and x.size == a[0].size for x in a):
+        return PreOpL_vec(or_op, a)
     else:
         return PreOpL(or_op, a)
 
@@ -368,9 +394,26 @@ def Pow2_from_bits(bits):
     pow2k = [None for i in range(m)]
     for i in range(m):
         pow2k[i] = two_power(2**i)
-        t[i] = t[i]*pow2k[i] + 1 - t[i]
+        # bit ? 2^(2^i) : 1 with one multiplication by a constant
+        t[i] = t[i]*(pow2k[i] - 1) + 1
+    return KMul(t)
+
+def Pow2Inv_from_bits(bits):
+    """ Field inverse of the power of two given by bits """
+    t = list(bits)
+    for i in range(len(t)):
+        # bit ? 2^-(2^i) : 1 with one multiplication by a constant
+        inv = types.cint(1, size=t[i].size).field_div(two_power(2**i))
+        t[i] = t[i]*(inv - 1) + 1
     return KMul(t)
 
+def Pow2AndInv(a, l):
+    """ 2^a and its field inverse from the same bit decomposition """
+    comparison.program.curr_tape.require_bit_length(l - 1)
+    m = int(ceil(log(l, 2)))
+    t = BitDec(a, m, m)
+    return Pow2_from_bits(t), Pow2Inv_from_bits(t)
+
 def B2U(a, l):
     pow2a = Pow2(a, l)
     return B2U_from_Pow2(pow2a, l), pow2a
@@ -2755,6 +2755,8 @@ class shuffle_base(base.DataInstruction):
 
     def add_apply_usage(self, req_node, n, record_size):
         req_node.increment(('bit', 'inverse'), float('inf'))
+        # the permutation is on records, not on single elements
+        n //= record_size
         logn = self.logn(n)
         n_switches = self.n_swaps(n) * self.n_relevant_parties
         if n != 2 ** logn:
@@ -2779,7 +2781,8 @@ class secshuffle(base.VectorInstruction, shuffle_base):
         assert len(args[0]) > args[2]
 
     def add_usage(self, req_node):
-        self.add_gen_usage(req_node, len(self.args[0]))
+        # generation counts records like gensecshuffle
+        self.add_gen_usage(req_node, len(self.args[0]) // self.args[2])
         self.add_apply_usage(req_node, len(self.args[0]), self.args[2])
 
 class gensecshuffle(shuffle_base):
@@ -3373,7 +3373,7 @@ def layers_from_torch(model, data_input_shape, batch_size, input_via=None,
                           (layers[-1].weights, layers[-1].bias)]
                 import numpy
                 swapped = numpy.moveaxis(
-                    numpy.array(item.weight.detach()), 1, -1)
+                    item.weight.detach().numpy(), 1, -1)
                 layers[-1].weights = \
                     layers[-1].weights.value_type.input_tensor_via(
                         input_via, swapped)
@@ -870,8 +870,10 @@ class Program(object):
                 return (abs(bl.i) + 63) // 64 * 8
 
     def reading(self, concept, reference):
+        if not self.options.papers:
+            return
         key = concept, reference
-        if self.options.papers and key not in self.recommended:
+        if key not in self.recommended:
             if isinstance(reference, tuple):
                 reference = ', '.join(papers.get(x) or x for x in reference)
             print('Recommended reading on %s: %s' % (
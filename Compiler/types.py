@@ -73,6 +73,7 @@ from . import util
 from . import instructions
 from .util import is_zero, is_one
 import operator
+import functools
 from functools import reduce
 import re
 
@@ -238,6 +239,30 @@ def type_comp(operation):
     copy_doc(type_check, operation)
     return type_check
 
+def comparison_operation(operation):
+    # read_mem_value, type_comp and vectorize in a single wrapper
+    def comparison(self, other, *args, **kwargs):
+        if isinstance(other, MemValue):
+            other = other.read()
+        if not isinstance(other, (type(self), int, regint, self.clear_type)):
+            return NotImplemented
+        if isinstance(other, Tape.Register) and other.size != self.size:
+            if min(other.size, self.size) == 1:
+                size = max(other.size, self.size)
+                self = self.expand_to_vector(size)
+                other = other.expand_to_vector(size)
+            else:
+                raise VectorMismatch('Different vector sizes of operands: %d/%d'
+                                     % (self.size, other.size))
+        set_global_vector_size(self.size)
+        try:
+            res = operation(self, other, *args, **kwargs)
+        finally:
+            reset_global_vector_size()
+        return res
+    copy_doc(comparison, operation)
+    return comparison
+
 def inputmixed(*args):
     # helper to cover both cases
     if isinstance(args[-1], int):
@@ -569,6 +594,13 @@ class _structure(Tape._no_truth):
 
     @classmethod
     def row_matrix_mul(cls, row, matrix, res_params=None):
+        if util.is_constant(len(row)) and \
+           len(row) * matrix.sizes[1] <= program.budget:
+            # unrolled for small shapes, summing in a tree takes
+            # logarithmically many rounds
+            return util.tree_reduce(operator.add, [
+                row[k].mul_no_reduce(matrix[k].get_vector(), res_params)
+                for k in range(len(row))]).reduce_after_mul()
         res = type(row[0].mul_no_reduce(
             matrix[0][0], res_params=res_params))(0, size=matrix.sizes[1])
         @library.for_range_opt(len(row))
@@ -648,7 +680,9 @@ class _secret_structure(_structure):
             requested_shape = shape
             if binary:
                 import numpy
-                content = numpy.array(content)
+                # C order as written below, also for views such as
+                # the result of numpy.moveaxis
+                content = numpy.ascontiguousarray(content)
                 if issubclass(cls, _fix):
                     min_k = \
                         math.ceil(math.log(abs(content).max() or 1, 2)) + cls.f + 1
@@ -711,6 +745,39 @@ class _vec(Tape._no_truth):
         for x, y in zip(self.v, other.v):
             x.link(y)
 
+class _block_cache(object):
+    """ Side table for values derived from register contents, valid
+    within the current basic block. The table is dropped as soon as
+    another block is current, so it doesn't keep earlier blocks or
+    their registers alive. Linking any register involved in an entry
+    invalidates that entry, see :py:meth:`_register.link`. """
+    block = None
+    entries = {}
+
+    @classmethod
+    def get(cls, source, key, function, registers):
+        """ Return cached ``function()`` for :py:obj:`source` and
+        :py:obj:`key`, computing it if necessary.
+
+        :param registers: function mapping the result to the
+          registers it consists of """
+        if program.curr_block is not cls.block:
+            cls.block = program.curr_block
+            cls.entries = {}
+        key = id(source), key
+        if key not in cls.entries:
+            res = function()
+            # the entry keeps the source alive, so its id stays unique
+            cls.entries[key] = res, [source] + list(registers(res))
+        return cls.entries[key][0]
+
+    @classmethod
+    def invalidate(cls, registers):
+        ids = set(id(reg) for reg in registers)
+        for key, (res, deps) in list(cls.entries.items()):
+            if any(id(reg) in ids for reg in deps):
+                del cls.entries[key]
+
 class _register(Tape.Register, _number, _structure):
     @staticmethod
     def n_elements():
@@ -839,6 +906,11 @@ class _register(Tape.Register, _number, _structure):
         res.program = self.program
         return res
 
+    def link(self, other):
+        super(_register, self).link(other)
+        # values derived from the old content of any duplicate are stale
+        _block_cache.invalidate(self.duplicates)
+
     def sizeof(self):
         return self.size
 
@@ -2253,6 +2325,13 @@ class _secret(_arithmetic_register, _secret_structure):
             size = val.size
         super(_secret, self).__init__(reg_type, val=val, size=size)
 
+    def cached_bit_decompose(self, key, function):
+        # the register content only changes when linked, so the bits
+        # can be reused within the same basic block
+        return list(_block_cache.get(
+            self, ('bit_decompose', key), function,
+            lambda bits: (x for x in bits if isinstance(x, Tape.Register))))
+
     @set_instruction_type
     @vectorize
     def load_int(self, val):
@@ -2822,9 +2901,7 @@ class sint(_secret, _int):
         """ Secret absolute. Uses global parameters for comparison. """
         return (self >= 0).if_else(self, -self)
 
-    @read_mem_value
-    @type_comp
-    @vectorize
+    @comparison_operation
     def __lt__(self, other, bit_length=None, sync=None):
         """ Secret comparison (signed).
 
@@ -2832,38 +2909,33 @@ class sint(_secret, _int):
         :param bit_length: bit length of input (default: global bit length)
         :return: 0/1 (sintbit) """
         res = sintbit()
-        comparison.LTZ(res, self - other,
+        # no subtraction needed for the common comparison with zero
+        comparison.LTZ(res, self if is_zero(other) else self - other,
                        (bit_length or program.bit_length) + 1)
         return res
 
-    @read_mem_value
-    @type_comp
-    @vectorize
+    @comparison_operation
     def __gt__(self, other, bit_length=None):
         res = sintbit()
         comparison.LTZ(res, other - self,
                        (bit_length or program.bit_length) + 1)
         return res
 
-    @read_mem_value
-    @type_comp
+    @comparison_operation
     def __le__(self, other, bit_length=None):
         return 1 - self.greater_than(other, bit_length)
 
-    @read_mem_value
-    @type_comp
+    @comparison_operation
     def __ge__(self, other, bit_length=None):
         return 1 - self.less_than(other, bit_length)
 
-    @read_mem_value
-    @type_comp
-    @vectorize
+    @comparison_operation
     def __eq__(self, other, bit_length=None):
         return sintbit.conv(
-            floatingpoint.EQZ(self - other, bit_length or program.bit_length))
+            floatingpoint.EQZ(self if is_zero(other) else self - other,
+                              bit_length or program.bit_length))
 
-    @read_mem_value
-    @type_comp
+    @comparison_operation
     def __ne__(self, other, bit_length=None):
         return 1 - self.equal(other, bit_length)
 
@@ -2979,8 +3051,10 @@ class sint(_secret, _int):
         if bit_length == 0:
             return []
         bit_length = bit_length or program.bit_length
-        return program.non_linear.bit_dec(self, bit_length, bit_length,
-                                          maybe_mixed)
+        return self.cached_bit_decompose(
+            (bit_length, maybe_mixed),
+            lambda: program.non_linear.bit_dec(self, bit_length, bit_length,
+                                               maybe_mixed))
 
     def TruncMul(self, other, k, m, nearest=False):
         return (self * other).round(k, m, nearest, signed=True)
@@ -3058,10 +3132,9 @@ class sint(_secret, _int):
         comparison.require_ring_size(length, 'splitting')
         from .GC.types import sbits
         from .GC.instructions import split
-        columns = [[sbits.get_type(self.size)()
-                    for i in range(n)] for i in range(length)]
-        split(n, self, *sum(columns, []))
-        return columns
+        flat = [sbits.get_type(self.size)() for i in range(length * n)]
+        split(n, self, *flat)
+        return [flat[i * n:(i + 1) * n] for i in range(length)]
 
     def split_to_two_summands(self, length, get_carry=False):
         n = program.use_split()
@@ -3116,9 +3189,11 @@ class sint(_secret, _int):
         r_prime = sint.get_random_int(m + sigma)
         r_pprime = sint.get_random_int(l + sigma)
 
+        # load the shift constant only once
+        shift = cint(2 ** (l + sigma))
         d_shared = sint(d)
-        h = (r + (r_prime << (l + sigma))) * d_shared
-        z_shared = ((self << (l + sigma)) + h + r_pprime)
+        h = (r + r_prime * shift) * d_shared
+        z_shared = self * shift + h + r_pprime
         z = z_shared.reveal_to(0)
 
         if active is None:
@@ -3126,9 +3201,9 @@ class sint(_secret, _int):
 
         if active:
             z_prime = [sint(x) for x in (z // d).bit_decompose(min_length)]
-            check = [(x * (1 - x)).reveal() == 0 for x in z_prime]
             z_pp = [sint(x) for x in (z % d).bit_decompose(l)]
-            check += [(x * (1 - x)).reveal() == 0 for x in z_pp]
+            bits = sint.concat(z_prime + z_pp)
+            check = (bits * (1 - bits)).reveal() == 0
             library.runtime_error_if(sum(check) != len(check),
                                      'private division')
             z_pp = sint.bit_compose(z_pp)
@@ -3216,7 +3291,7 @@ class sint(_secret, _int):
     def concat(cls, parts):
         parts = list(parts)
         res = cls(size=sum(len(part) for part in parts))
-        args = sum(([len(part), part] for part in parts), [])
+        args = [x for part in parts for x in (len(part), part)]
         concats(res, *args)
         return res
 
@@ -3433,6 +3508,11 @@ class sgf2n(_secret, _gf2n):
         if bit_length == 0:
             return []
         bit_length = bit_length or program.galois_length
+        return self.cached_bit_decompose(
+            (bit_length, step),
+            lambda: self._bit_decompose(bit_length, step))
+
+    def _bit_decompose(self, bit_length, step):
         random_bits = [self.get_random_bit() \
                            for i in range(0, bit_length, step)]
 
@@ -3623,7 +3703,15 @@ class _bitint(Tape._no_truth):
         diff = [ai + bi for (ai,bi) in reversed(list(zip(a,b)))]
         preor = floatingpoint.PreOR(diff, raw=True)
         highest_diff = [x - y for (x,y) in reversed(list(zip(preor, [0] + preor)))]
-        raw = sum(map(operator.mul, highest_diff, (a,b)[index]))
+        selected = list((a,b)[index])
+        t = type(highest_diff[0])
+        if issubclass(t, _secret) and \
+           all(isinstance(x, t) and x.size == highest_diff[0].size
+               for x in highest_diff + selected):
+            # one dot product instead of a multiplication per bit
+            raw = t.dot_product(highest_diff, selected)
+        else:
+            raw = sum(map(operator.mul, highest_diff, selected))
         return raw.bit_decompose()[0]
 
     def add(self, other):
@@ -3659,36 +3747,104 @@ class _bitint(Tape._no_truth):
 
     @classmethod
     def wallace_tree_from_matrix(cls, bit_matrix, get_carry=True):
-        columns = [[_f for _f in (bit_matrix[j][i-j] \
-                                     for j in range(min(len(bit_matrix), i + 1))) \
-                    if not is_zero(_f)] \
-                       for i in range(len(bit_matrix[0]))]
+        columns = cls.build_wallace_columns(bit_matrix)
         return cls.wallace_tree_from_columns(columns, get_carry)
 
+    @staticmethod
+    def build_wallace_columns(bit_matrix):
+        # single pass over the rows, row j contributes from column j
+        columns = [[] for i in range(len(bit_matrix[0]))]
+        for j, row in enumerate(bit_matrix):
+            for x, col in zip(row, columns[j:]):
+                if not is_zero(x):
+                    col.append(x)
+        return columns
+
     @classmethod
     def wallace_tree_without_finish(cls, columns, get_carry=True):
-        self = cls
-        columns = [col[:] for col in columns]
-        while max(len(c) for c in columns) > 2:
-            new_columns = [[] for i in range(len(columns) + 1)]
-            for i,col in enumerate(columns):
-                while len(col) > 2:
-                    s, carry = self.full_adder(*(col.pop() for i in range(3)))
-                    new_columns[i].append(s)
-                    new_columns[i+1].append(carry)
-                if len(col) == 2:
-                    s, carry = self.half_adder(*(col.pop() for i in range(2)))
-                    new_columns[i].append(s)
-                    new_columns[i+1].append(carry)
+        # the adders below never turn symbolic bits into constants
+        columns = cls.fold_constant_columns(columns, get_carry)
+        calls, output = cls.wallace_schedule(tuple(len(c) for c in columns),
+                                             get_carry)
+        values = [x for col in columns for x in col]
+        get = lambda indices: [0 if i is None else values[i] for i in indices]
+        for call in calls:
+            sums, carries = cls.full_adder_vec(*(get(x) for x in call))
+            values += sums
+            values += carries
+        return tuple(get(x) for x in output)
+
+    wallace_schedules = {}
+
+    @classmethod
+    def wallace_schedule(cls, lengths, get_carry=True):
+        """ Adder calls of a Wallace tree on columns of given lengths,
+        which only depend on the lengths. The operands are indices into
+        the column entries followed by the sums and carries of every
+        call, and None stands for zero.
+
+        :returns: list of operand lists for :py:meth:`full_adder_vec`,
+          pair of index lists for the two summands """
+        key = lengths, get_carry
+        if key not in _bitint.wallace_schedules:
+            calls = []
+            n_values = [sum(lengths)]
+            def adder(*operands):
+                n = len(operands[0])
+                if not n:
+                    return [], []
+                calls.append(operands)
+                start = n_values[0]
+                n_values[0] += 2 * n
+                return (list(range(start, start + n)),
+                        list(range(start + n, start + 2 * n)))
+            indices = iter(range(sum(lengths)))
+            columns = [[next(indices) for i in range(n)] for n in lengths]
+            while max(len(c) for c in columns) > 2:
+                new_columns = cls.three_two_layer(columns, adder)
+                if get_carry:
+                    columns = new_columns
                 else:
-                    new_columns[i].extend(col)
-            if get_carry:
-                columns = new_columns
-            else:
-                columns = new_columns[:-1]
+                    columns = new_columns[:-1]
+            output = tuple(list(x) for x in zip(
+                *(col + [None] * (2 - len(col)) for col in columns)))
+            _bitint.wallace_schedules[key] = calls, output
+        return _bitint.wallace_schedules[key]
+
+    @staticmethod
+    def three_two_layer(columns, adder):
+        """ One layer of full adders consuming every column from the
+        end and half adders on remaining pairs.
+
+        :returns: new columns (one more than given) """
+        triples = [], [], []
+        pairs = [], []
         for col in columns:
-            col.extend([0] * (2 - len(col)))
-        return tuple(list(x) for x in zip(*columns))
+            for j in range(len(col), 2, -3):
+                for x, k in zip(triples, (1, 2, 3)):
+                    x.append(col[j - k])
+            if len(col) % 3 == 2:
+                pairs[0].append(col[1])
+                pairs[1].append(col[0])
+        sums, carries = adder(*triples)
+        half_sums, half_carries = adder(*pairs, [None] * len(pairs[0]))
+        new_columns = [[] for i in range(len(columns) + 1)]
+        k = 0
+        h = 0
+        for col, new, new_next in zip(columns, new_columns,
+                                      new_columns[1:]):
+            n_full = len(range(len(col), 2, -3))
+            new.extend(sums[k:k + n_full])
+            new_next.extend(carries[k:k + n_full])
+            k += n_full
+            rest = col[:len(col) - 3 * n_full]
+            if len(rest) == 2:
+                new.append(half_sums[h])
+                new_next.append(half_carries[h])
+                h += 1
+            else:
+                new.extend(rest)
+        return new_columns
 
     @classmethod
     def wallace_tree_from_columns(cls, columns, get_carry=True):
@@ -3699,11 +3855,67 @@ class _bitint(Tape._no_truth):
     def wallace_tree(cls, rows):
         return cls.wallace_tree_from_columns([list(x) for x in zip(*rows)])
 
+    @classmethod
+    def full_adder_vec(cls, a, b, c):
+        """ Full adders on lists of bits.
+
+        :returns: list of sums, list of carries """
+        full_adder = cls.full_adder
+        sums, carries = [], []
+        for x in zip(a, b, c):
+            if any(util.is_constant(y) for y in x):
+                s, carry = cls.add_constant(
+                    [y for y in x if not util.is_constant(y)],
+                    sum(y for y in x if util.is_constant(y)))
+            else:
+                s, carry = full_adder(*x)
+            sums.append(s)
+            carries.append(carry)
+        return sums, carries
+
+    @classmethod
+    def add_constant(cls, bits, constant):
+        """ Add constant to the sum of up to two bits without emitting
+        instructions for the constant.
+
+        :returns: sum, carry """
+        if not bits:
+            return constant & 1, constant >> 1
+        elif len(bits) == 1:
+            x, = bits
+            if constant == 0:
+                return x, 0
+            elif constant == 1:
+                return x.bit_not(), x
+            elif constant == 2:
+                return x, 1
+        elif constant == 0:
+            return cls.half_adder(*bits)
+        return cls.full_adder(*bits, constant)
+
+    @staticmethod
+    def fold_constant_columns(columns, get_carry=True):
+        """ Add up the constant bits of Wallace-tree columns, leaving at
+        most one constant one at the start of each column. """
+        total = 0
+        res = []
+        for i, col in enumerate(columns):
+            if any(util.is_constant(x) for x in col):
+                total += sum(x for x in col if util.is_constant(x)) << i
+                col = [x for x in col if not util.is_constant(x)]
+            res.append(col)
+        if get_carry:
+            while total >> len(res):
+                res.append([])
+        for i, col in enumerate(res):
+            if (total >> i) & 1:
+                res[i] = [1] + col
+        return res
+
     @classmethod
     def wallace_reduction(cls, a, b, c, get_carry=True):
         assert len(a) == len(b) == len(c)
-        tmp = zip(*(cls.full_adder(*x) for x in zip(a, b, c)))
-        sums, carries = (list(x) for x in tmp)
+        sums, carries = cls.full_adder_vec(a, b, c)
         carries = [0] + carries
         if get_carry:
             sums += [0]
@@ -3711,6 +3923,15 @@ class _bitint(Tape._no_truth):
             del carries[-1]
         return sums, carries
 
+    @staticmethod
+    def bit_width(bits):
+        """ Number of bits in the first non-constant bit register (more
+        than one for vectorized binary circuits), 1 by default. """
+        for x in bits:
+            if not util.is_constant(x):
+                return getattr(x, 'n', 1)
+        return 1
+
     def expand(self, other):
         a = self.bit_decompose()
         b = util.bit_decompose(other, self.n_bits)
@@ -3724,18 +3945,20 @@ class _bitint(Tape._no_truth):
             a, b = self.expand(other)
         except:
             return NotImplemented
-        n = 1
-        for x in (a + b):
-            try:
-                n = x.n
-                break
-            except:
-                pass
-        d = [(bit_not(bit_xor(ai, bi), n), bit_and(bit_not(ai, n), bi))
-             for (ai,bi) in zip(a,b)]
-        borrow = lambda y,x,*args: \
-            (bit_and(x[0], y[0]), util.OR(x[1], bit_and(x[0], y[1])))
-        borrows = (0,) + list(zip(*floatingpoint.PreOpL(borrow, d)))[1]
+        n = self.bit_width(a + b)
+        p = [bit_not(bit_xor(ai, bi), n) for (ai,bi) in zip(a,b)]
+        g = [bit_and(bit_not(ai, n), bi) for (ai,bi) in zip(a,b)]
+        # prefix borrows in the pattern of floatingpoint.PreOpL
+        k = len(g)
+        step = 1
+        while step < k:
+            for y in range(step - 1, k - 1, 2 * step):
+                for z in range(y + 1, min(y + step + 1, k)):
+                    pz = p[z]
+                    p[z] = bit_and(pz, p[y])
+                    g[z] = util.OR(g[z], bit_and(pz, g[y]))
+            step *= 2
+        borrows = [0] + g[:-1]
         return self.compose(reduce(util.bit_xor, (ai, bi, borrow)) \
                                 for (ai,bi,borrow) in zip(a,b,borrows))
 
@@ -3749,10 +3972,13 @@ class _bitint(Tape._no_truth):
         raise NotImplementedError()
 
     def __lshift__(self, other):
-        return self.compose(([0] * other + self.bit_decompose())[:self.n_bits])
+        k = min(other, self.n_bits)
+        return self.compose([0] * k + self.bit_decompose(self.n_bits - k))
 
     def __rshift__(self, other):
-        return self.compose(self.bit_decompose()[other:])
+        bits = self.bit_decompose()
+        del bits[:other]
+        return self.compose(bits)
 
     def bit_decompose(self, n_bits=None):
         if self.bits is None:
@@ -3762,16 +3988,27 @@ class _bitint(Tape._no_truth):
         else:
             return self.bits[:n_bits] + [self.fill_bit()] * (n_bits - self.n_bits)
 
+    def bit_not_decompose(self, n=1):
+        """ Complement of the bits, reused within a basic block. """
+        return list(_block_cache.get(
+            self, ('bit_not', n),
+            lambda: [util.bit_not(b, n) for b in self.bit_decompose()],
+            lambda bits: (x for x in bits if isinstance(x, Tape.Register))))
+
     def fill_bit(self):
         return self.bits[-1]
 
     @staticmethod
     def prep_comparison(a, b):
+        """ Swap the sign bits of the fresh bit lists from
+        :py:meth:`expand`.
+
+        :returns: the two lists """
         a[-1], b[-1] = b[-1], a[-1]
-    
+        return a, b
+
     def comparison(self, other, const_rounds=False, index=None):
-        a, b = self.expand(other)
-        self.prep_comparison(a, b)
+        a, b = self.prep_comparison(*self.expand(other))
         if const_rounds:
             return self.get_highest_different_bits(a, b, index)
         else:
@@ -3817,15 +4054,8 @@ class _bitint(Tape._no_truth):
     equal = __eq__
 
     def __neg__(self):
-        bits = self.bit_decompose()
-        n = 1
-        for b in bits:
-            try:
-                n = x.n
-                break
-            except:
-                pass
-        return 1 + self.compose(util.bit_not(b, n) for b in bits)
+        n = self.bit_width(self.bit_decompose())
+        return 1 + self.compose(self.bit_not_decompose(n))
 
     def __abs__(self):
         return util.if_else(self.bit_decompose()[-1], -self, self)
@@ -3840,13 +4070,17 @@ class _bitint(Tape._no_truth):
 class intbitint(_bitint, sint):
     @staticmethod
     def full_adder(a, b, carry):
+        # the sum is linear in the inputs once the carry is known,
+        # which saves the second XOR multiplication
         s = a.bit_xor(b)
-        return s.bit_xor(carry), util.if_else(s, carry, a)
+        carry_out = util.if_else(s, carry, a)
+        return a + b + carry - 2 * carry_out, carry_out
 
     @staticmethod
     def sum_from_carries(a, b, carries):
-        return [a[i] + b[i] + carries[i] - 2 * carries[i + 1] \
-                for i in range(len(a))]
+        return [ai + bi + carry - 2 * next_carry
+                for ai, bi, carry, next_carry in
+                zip(a, b, carries, carries[1:])]
 
     @classmethod
     def bit_adder_selection(cls, a, b, carry_in=0, get_carry=False):
@@ -3869,7 +4103,18 @@ class sgf2nint(_bitint, sgf2n):
             raise CompilerError('Too many bits')
         res = cls()
         res.bits = bits + [0] * (cls.n_bits - len(bits))
-        gmovs(res, sum(b << i for i,b in enumerate(bits)))
+        # constant bits at compile time, no shift of the lowest bit
+        constant = sum(b << i for i,b in enumerate(bits)
+                       if util.is_constant(b))
+        terms = [b << i if i else b for i,b in enumerate(bits)
+                 if not util.is_constant(b)]
+        if terms:
+            value = util.tree_reduce(operator.add, terms)
+            if constant:
+                value += constant
+        else:
+            value = sgf2n(constant)
+        gmovs(res, value)
         return res
 
     @staticmethod
@@ -3897,6 +4142,22 @@ class sgf2nint(_bitint, sgf2n):
     def force_bit_decompose(self, n_bits=None):
         return sgf2n(self).bit_decompose(n_bits)
 
+    def __eq__(self, other, bit_length=None):
+        # with known bits, comparing to a constant does not need a bit
+        # decomposition, and positions known to be equal are skipped
+        if self.bits is not None and util.is_constant(other) and \
+           other >= 0:
+            a, b = self.expand(other)
+            diff_bits = [util.bit_xor(x, y) for x, y in zip(a, b)]
+            diff_bits = diff_bits[:bit_length]
+            symbolic = [x for x in diff_bits if not util.is_constant(x)]
+            if symbolic and not any(util.is_one(x) for x in diff_bits):
+                return util.tree_reduce(lambda x, y: x.bit_and(y),
+                                        [x.bit_not() for x in symbolic])
+        return super(sgf2nint, self).__eq__(other, bit_length)
+
+    equal = __eq__
+
 class sgf2nuint(sgf2nint):
     def load_int(self, other):
         if 0 <= other < 2**self.n_bits:
@@ -3910,7 +4171,7 @@ class sgf2nuint(sgf2nint):
 
     @staticmethod
     def prep_comparison(a, b):
-        pass
+        return a, b
 
 class sgf2nuint32(sgf2nuint):
     n_bits = 32
@@ -3949,10 +4210,12 @@ class sgf2nfloat(sgf2n):
         super(sgf2nfloat, self).__init__()
         if p is None and type(val) == sgf2n:
             bits = val.bit_decompose(self.vlen + self.plen + 1)
-            self.v = self.v_type.compose(bits[:self.vlen])
+            v_bits = bits[:self.vlen]
+            self.v = self.v_type.compose(v_bits)
             self.p = self.p_type.compose(bits[self.vlen:-1])
             self.s = bits[-1]
-            self.z = util.tree_reduce(operator.mul, (1 - b for b in self.v.bits))
+            # not the zero padding of self.v.bits
+            self.z = util.tree_reduce(operator.mul, (1 - b for b in v_bits))
         else:
             if p is None:
                 v, p, z, s = sfloat.convert_float(val, self.vlen, self.plen)
@@ -3990,13 +4253,27 @@ class sgf2nfloat(sgf2n):
         pow_p0 = 1 + self.v_type(tmp)
         v = (v * pow_p0) >> 2
         p = pmax - sum(self.p_type.compose([1 - b]) for b in h) + 1
-        v = self.z.if_else(other.v, other.z.if_else(self.v, v))
-        z = v == 0
-        p = z.if_else(0, self.z.if_else(other.p, other.z.if_else(self.p, p)))
         s = other_dominates.if_else(other.s, self.s)
-        s = self.z.if_else(other.s, other.z.if_else(self.s, s))
+        v, p, s = self.zero_mux(other, ((self.v, other.v, v),
+                                        (self.p, other.p, p),
+                                        (self.s, other.s, s)))
+        z = v == 0
+        p = z.if_else(0, p)
         return sgf2nfloat(v, p, z, s)
 
+    def zero_mux(self, other, triples):
+        """ Select the value of :py:obj:`other` if :py:obj:`self` is
+        zero, the value of :py:obj:`self` if only :py:obj:`other` is
+        zero, and the computed value otherwise. Both selections
+        are done by independent multiplications.
+
+        :param triples: iterable of (value of self, value of other,
+          computed value) """
+        other_only = other.z * self.z.bit_not()
+        hard_conv = self.z.hard_conv
+        return [c ^ self.z * hard_conv(o ^ c) ^ other_only * hard_conv(s ^ c)
+                for s, o, c in triples]
+
     def mul(self, other):
         v = (self.v * other.v) >> (self.vlen - 1)
         b = v.bits[self.vlen]
@@ -4010,6 +4287,17 @@ sgf2nfloat.set_precision(24, 8)
 
 def parse_type(other, k=None, f=None):
     # converts type to cfix/sfix depending on the case
+    if isinstance(other, (regint, cint, sint)) and None not in (k, f):
+        # the conversion of a register can be reused within the
+        # basic block, see _block_cache
+        res = _block_cache.get(other, ('parse_type', k, f),
+                               lambda: _parse_type(other, k, f),
+                               lambda res: [res.v])
+        # fresh wrapper so that callers can't change each other's operand
+        return type(res)._new(res.v, k=res.k, f=res.f)
+    return _parse_type(other, k, f)
+
+def _parse_type(other, k=None, f=None):
     if isinstance(other, cfix.scalars):
         return cfix(other, k=k, f=f)
     elif isinstance(other, cint):
@@ -4045,6 +4333,7 @@ class cfix(_number, _structure):
     """
     __slots__ = ['value', 'f', 'k']
     reg_type = 'c'
+    is_fix = True
     scalars = (int, float, regint, cint)
     @classmethod
     def set_precision(cls, f, k = None):
@@ -4124,26 +4413,66 @@ class cfix(_number, _structure):
     @classmethod
     def _new(cls, other, k=None, f=None):
         assert not isinstance(other, (list, tuple))
-        res = cls(k=k, f=f)
+        # not via __init__, which would load a zero to be overwritten
+        res = cls.__new__(cls)
+        res.f = cls.f if f is None else f
+        res.k = cls.k if k is None else k
         res.v = cint.conv(other)
         return res
 
+    int_rep_functions = {}
+
     @staticmethod
     def int_rep(v, f, k=None):
-        if isinstance(v, regint):
-            v = cint(v)
-        res = v * (2 ** f)
         try:
-            res = int(round(res))
-            if k and res >= 2 ** (k - 1) or res < -2 ** (k - 1):
+            function = cfix.int_rep_functions[f, k]
+        except KeyError:
+            function = cfix.int_rep_functions[f, k] = cfix.make_int_rep(f, k)
+        return function(v)
+
+    @staticmethod
+    def int_rep_vec(values, f, k=None):
+        """ Integer representation of several values with the same
+        precision. """
+        try:
+            function = cfix.int_rep_functions[f, k]
+        except KeyError:
+            function = cfix.int_rep_functions[f, k] = cfix.make_int_rep(f, k)
+        return [function(v) for v in values]
+
+    @staticmethod
+    def make_int_rep(f, k=None):
+        """ Conversion to the integer representation with the scale and
+        range computed once per precision. """
+        scale = 2 ** f
+        if k:
+            low, high = -2 ** (k - 1), 2 ** (k - 1)
+        else:
+            low = high = None
+        @functools.lru_cache(maxsize=4096)
+        def number_rep(v):
+            return int_rep(v)
+        def int_rep_cached(v):
+            # repeated constants such as weights are common
+            if type(v) in (int, float):
+                return number_rep(v)
+            return int_rep(v)
+        def int_rep(v):
+            if isinstance(v, regint):
+                v = cint(v)
+            res = v * scale
+            try:
+                res = int(round(res))
+            except TypeError:
+                return res
+            if high is not None and not low <= res < high:
                 limit = 2 ** (k - f - 1)
                 raise CompilerError(
                     'Value out of fixed-point range [-%d, %d). '
                     'Use `sfix.set_precision(f, k)` with k being at least f+%d'
                     % (limit, limit, res.bit_length() - f + 1))
-        except TypeError:
-            pass
-        return res
+            return res
+        return int_rep_cached
 
     @vectorize_init
     @read_mem_value
@@ -4514,15 +4843,18 @@ class _single(_number, _secret_structure):
 
     @classmethod
     def unreduced_dot_product(cls, x, y, res_params=None):
-        dp = cls.int_type.dot_product([xx.pre_mul() for xx in x],
-                                      [yy.pre_mul() for yy in y])
+        dp = cls.int_type.dot_product(cls.pre_mul_all(x), cls.pre_mul_all(y))
         return x[0].unreduced(dp, y[0], res_params, len(x))
 
+    @classmethod
+    def pre_mul_all(cls, x):
+        """ :py:meth:`pre_mul` of every element. """
+        return [xx.pre_mul() for xx in x]
+
     @classmethod
     def row_matrix_mul(cls, row, matrix, res_params=None):
         int_matrix = [y.get_vector().pre_mul() for y in matrix]
-        col = cls.int_type.row_matrix_mul([x.pre_mul() for x in row],
-                                          int_matrix)
+        col = cls.int_type.row_matrix_mul(cls.pre_mul_all(row), int_matrix)
         res = row[0].unreduced(col, matrix[0][0], res_params,
                                len(row)).reduce_after_mul()
         return res
@@ -4659,6 +4991,7 @@ class _fix(_single):
     """ Secret fixed point type. """
     __slots__ = ['v', 'f', 'k']
     is_clear = False
+    is_fix = True
 
     def set_precision(cls, f, k = None):
         cls.f = f
@@ -4670,17 +5003,19 @@ class _fix(_single):
     set_precision.__doc__ = cfix.set_precision.__doc__
     set_precision = classmethod(set_precision)
 
+    precision_arg = re.compile('([fk])([0-9]+)$')
+
     @classmethod
     def set_precision_from_args(cls, program, adapt_ring=False):
         f = None
         k = None
         for arg in program.args:
-            m = re.match('f([0-9]+)$', arg)
+            m = cls.precision_arg.match(arg)
             if m:
-                f = int(m.group(1))
-            m = re.match('k([0-9]+)$', arg)
-            if m:
-                k = int(m.group(1))
+                if m.group(1) == 'f':
+                    f = int(m.group(2))
+                else:
+                    k = int(m.group(2))
         if f is not None:
             print ('Setting fixed-point precision to %d/%s' % (f, k))
             cls.set_precision(f, k)
@@ -4701,7 +5036,7 @@ class _fix(_single):
 
     @classmethod
     def coerce(cls, other, equal_precision=None):
-        if isinstance(other, (_fix, cls.clear_type)):
+        if type(other) is cls or isinstance(other, (_fix, cls.clear_type)):
             return other
         else:
             return cls.conv(other)
@@ -4728,6 +5063,18 @@ class _fix(_single):
         res.v = cls.int_type.conv(other)
         return res
 
+    @staticmethod
+    def adjust_precision(v, f):
+        """ Integer representation of fixed-point value :py:obj:`v` with
+        :py:obj:`f` fractional bits. """
+        f_diff = v.f - f
+        v = v.v
+        if f_diff < 0:
+            v <<= -f_diff
+        elif f_diff > 0:
+            v >>= f_diff
+        return v
+
     @vectorize_init
     def __init__(self, _v=None, k=None, f=None, size=None, initialize=True):
         if k is None:
@@ -4740,15 +5087,10 @@ class _fix(_single):
             self.f = f
         assert k is not None
         assert f is not None
-        def adjust(v):
-            f_diff = v.f - f
-            v = v.v
-            if f_diff < 0:
-                v <<= -f_diff
-            elif f_diff > 0:
-                v >>= f_diff
-            return v
-        if _v is None:
+        if type(_v) in (int, float):
+            # most common case first, no walk of the class hierarchy
+            self.v = self.int_type(cfix.int_rep(_v, f=f, k=k), size=size)
+        elif _v is None:
             if initialize:
                 self.v = self.int_type(0)
             else:
@@ -4760,19 +5102,24 @@ class _fix(_single):
         elif isinstance(_v, self.float_type):
             p = (f + _v.p)
             b = (p.greater_equal(0, _v.vlen))
-            a = b*(_v.v << (p)) + (1-b)*(_v.v >> (-p))
+            a = b.if_else(_v.v << p, _v.v >> (-p))
             self.v = (1-2*_v.s)*a
         elif isinstance(_v, type(self)):
             self.v = self.int_type(_v.v)
         elif isinstance(_v, cfix):
-            self.v = self.int_type(adjust(_v))
+            self.v = self.int_type(self.adjust_precision(_v, f))
         elif isinstance(_v, (MemValue, MemFix)):
             #this is a memvalue object
             self.v = type(self)(_v.read()).v
         elif isinstance(_v, (list, tuple)):
-            self.v = self.int_type(list(self.conv(x).v for x in _v))
+            if all(isinstance(x, cfix.scalars) for x in _v):
+                # public values directly into the vector
+                self.v = self.int_type(cfix.int_rep_vec(_v, f=f, k=k))
+            else:
+                self.v = self.int_type(list(self.conv(x).v for x in _v))
         elif isinstance(_v, personal):
-            self.v = self.int_type(personal(_v.player, adjust(_v._v)))
+            self.v = self.int_type(personal(
+                _v.player, self.adjust_precision(_v._v, f)))
         else:
             raise CompilerError('cannot convert %s to sfix' % _v)
         if not isinstance(self.v, self.int_type):
@@ -4791,7 +5138,7 @@ class _fix(_single):
 
         :param other: sfix/cfix/sint/cint/regint/int """
         other = self.coerce(other)
-        if isinstance(other, (_fix, cfix)):
+        if getattr(other, 'is_fix', False):
             return self._new(self.v + other.v, k=self.k, f=self.f)
         elif isinstance(other, cfix.scalars):
             tmp = cfix(other, k=self.k, f=self.f)
@@ -4799,6 +5146,23 @@ class _fix(_single):
         else:
             return NotImplemented
 
+    float_multipliers = {}
+
+    @staticmethod
+    def float_multiplier(other, f):
+        """ Smallest integer representation of a constant with at most
+        :py:obj:`f` fractional bits.
+
+        :return: tuple of integer, bit length, and fractional bits """
+        v = int(round(other * 2 ** f))
+        if v == 0:
+            return 0, None, None
+        while v % 2 == 0:
+            f -= 1
+            v //= 2
+        k = len(bin(abs(v))) - 1
+        return v, k, f
+
     def mul(self, other):
         """ Secret fixed-point multiplication.
 
@@ -4808,14 +5172,18 @@ class _fix(_single):
         elif isinstance(other, float):
             if int(other) == other:
                 return self.mul(int(other))
-            v = int(round(other * 2 ** self.f))
+            try:
+                v, k, f = self.float_multipliers[other, self.f]
+            except KeyError:
+                v, k, f = self.float_multipliers[other, self.f] = \
+                    self.float_multiplier(other, self.f)
             if v == 0:
                 return 0
-            f = self.f
-            while v % 2 == 0:
-                f -= 1
-                v //= 2
-            k = len(bin(abs(v))) - 1
+            if v == 1 and issubclass(self.int_type, sint):
+                # power of two, truncation suffices
+                val = self.v.round(self.k + f, f, nearest=self.round_nearest,
+                                   signed=True)
+                return self._new(val, k=self.k, f=self.f)
             other = self.multipliable(v, k, f, self.size)
         try:
             other = self.coerce(other, equal_precision=False)
@@ -4823,8 +5191,9 @@ class _fix(_single):
             return NotImplemented
         if isinstance(other, (_fix, self.clear_type)):
             k = max(self.k, other.k)
-            max_f = max(self.f, other.f)
-            min_f = min(self.f, other.f)
+            min_f, max_f = self.f, other.f
+            if min_f > max_f:
+                min_f, max_f = max_f, min_f
             val = self.v.TruncMul(other.v, k + min_f, min_f,
                                   nearest=self.round_nearest)
             if 'vec' not in self.__dict__:
@@ -4837,7 +5206,6 @@ class _fix(_single):
         else:
             return NotImplemented
 
-    @vectorize
     def __neg__(self):
         """ Secret fixed-point negation. """
         return self._new(-self.v, k=self.k, f=self.f)
@@ -4847,27 +5215,32 @@ class _fix(_single):
         """ Secret fixed-point division.
 
         :param other: sfix/cfix/sint/cint/regint/int """
+        k, f = self.k, self.f
         if util.is_constant_float(other):
             assert other != 0
-            log = math.ceil(math.log(abs(other), 2))
-            if 2 ** log == other and log < self.f:
+            if isinstance(other, int):
+                # exact for integers, no floating-point logarithm
+                log = (abs(other) - 1).bit_length()
+            else:
+                log = math.ceil(math.log(abs(other), 2))
+            if 2 ** log == other and log < f:
                 return self * 2 ** -log
-            other_length = self.f + log
-            if other_length >= self.k - 1:
-                factor = 2 ** (self.k - other_length - 2)
+            other_length = f + log
+            if other_length >= k - 1:
+                factor = 2 ** (k - other_length - 2)
                 self *= factor
                 other *= factor
             if util.is_zero(self):
                 return 0
         other = self.coerce(other)
-        assert self.k == other.k
-        assert self.f == other.f
-        if isinstance(other, (_fix, cfix)):
-            v = library.FPDiv(self.v, other.v, self.k, self.f,
+        assert k == other.k
+        assert f == other.f
+        if getattr(other, 'is_fix', False):
+            v = library.FPDiv(self.v, other.v, k, f,
                               nearest=self.round_nearest)
         else:
             raise TypeError('Incompatible fixed point types in division')
-        return self._new(v, k=self.k, f=self.f)
+        return self._new(v, k=k, f=f)
 
     @vectorize
     def __rtruediv__(self, other):
@@ -4882,14 +5255,21 @@ class _fix(_single):
         return type(self)(library.FPDiv(cint(2) ** self.f, self.v, self.k,
                                         self.f, nearest=True))
 
+    revealed_types = {}
+
     def reveal(self):
         """ Reveal secret fixed-point number.
 
         :return: relevant clear type """
         val = self.v.reveal()
-        class revealed_fix(self.clear_type):
-            f = self.f
-            k = self.k
+        key = self.clear_type, self.f, self.k
+        try:
+            revealed_fix = self.revealed_types[key]
+        except KeyError:
+            class revealed_fix(self.clear_type):
+                f = self.f
+                k = self.k
+            self.revealed_types[key] = revealed_fix
         return revealed_fix._new(val)
 
     def bit_decompose(self, n_bits=None):
@@ -4908,6 +5288,21 @@ class _fix(_single):
         assert self.f == other.f
         self.v.update(other.v)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def random_range(lower, upper, f, k):
+        """ Number of random bits, scaling factor, actual width, and
+        centre for :py:func:`get_random`. """
+        log_range = int(math.log(upper - lower, 2))
+        n_bits = log_range + f
+        gen_range = (2 ** (n_bits) - 1) / 2 ** f
+        diff = upper - lower
+        factor = diff / gen_range
+        real = lambda x: cfix.int_rep(x, f, k) * 2 ** -f
+        real_range = real(real(factor) * gen_range)
+        average = lower + 0.5 * (upper - lower)
+        return n_bits, factor, real_range, average
+
     @vectorized_classmethod
     def get_random(cls, lower, upper, symmetric=True, public_randomness=False):
         """ Uniform secret random number around centre of bounds.
@@ -4927,14 +5322,9 @@ class _fix(_single):
             get_random_bit = cls.int_type.get_random_bit
         f = cls.f
         k = cls.k
-        log_range = int(math.log(upper - lower, 2))
-        n_bits = log_range + cls.f
-        gen_range = (2 ** (n_bits) - 1) / 2 ** cls.f
-        diff = upper - lower
-        factor = diff / gen_range
         real = lambda x: cfix.int_rep(x, f, k) * 2 ** -f
-        real_range = real(real(factor) * gen_range)
-        average = lower + 0.5 * (upper - lower)
+        n_bits, factor, real_range, average = cls.random_range(
+            lower, upper, f, k)
         lower = average - 0.5 * real_range
         upper = average + 0.5 * real_range
         r = cls._new(get_random_int(n_bits)) * factor + lower
@@ -5064,6 +5454,11 @@ class sfix(_fix):
     def pre_mul(self):
         return self.v
 
+    @classmethod
+    def pre_mul_all(cls, x):
+        # no method call per element
+        return [xx.v for xx in x]
+
     def unreduced(self, v, other=None, res_params=None, n_summands=1):
         assert res_params is None or \
             (res_params.k == self.k and res_params.f == self.f)
@@ -5091,6 +5486,10 @@ class sfix(_fix):
         else:
             other = list(other)
             assert len(self) == len(other)
+            if all(isinstance(x, sfix) and x.size == 1 and
+                   (x.k, x.f) == (self.k, self.f) for x in other):
+                # one truncation instead of one per product
+                return self.dot(type(self).concat(other))
             return sum(a * b for a, b in zip(self, other))
 
     def reveal_to(self, player):
@@ -5125,24 +5524,18 @@ class sfix(_fix):
     @classmethod
     def concat(cls, parts):
         parts = list(parts)
-        int_parts = []
         f = parts[0].f
         k = parts[0].k
-        for part in parts:
-            assert part.f == f
-            assert part.k == k
-            int_parts.append(part.v)
+        assert all(part.f == f and part.k == k for part in parts)
+        int_parts = list(map(operator.attrgetter('v'), parts))
         return cls._new(cls.int_type.concat(int_parts), k=k, f=f)
 
     @classmethod
     def zip(cls, *parts):
-        int_parts = []
         f = parts[0].f
         k = parts[0].k
-        for part in parts:
-            assert part.f == f
-            assert part.k == k
-            int_parts.append(part.v)
+        assert all(part.f == f and part.k == k for part in parts)
+        int_parts = map(operator.attrgetter('v'), parts)
         return cls._new(cls.int_type.zip(*int_parts), k=k, f=f)
 
     def __repr__(self):
@@ -5262,7 +5655,8 @@ class squant(_single):
     def add(self, other):
         other = self.coerce(other)
         assert self.get_params() == other.get_params()
-        return self._new(self.v + other.v - util.expand(self.Z, self.v.size))
+        return self._new(self.v + other.v -
+                         self.params.expanded_Z(self.v.size))
 
     def mul(self, other, res_params=None):
         return self.mul_no_reduce(other, res_params).reduce_after_mul()
@@ -5277,7 +5671,7 @@ class squant(_single):
                                        res_params=res_params)
 
     def pre_mul(self):
-        return self.v - util.expand(self.Z, self.v.size)
+        return self.v - self.params.expanded_Z(self.v.size)
 
     def unreduced(self, v, other, res_params=None, n_summands=1):
         return _unreduced_squant(v, (self.get_params(), other.get_params()),
@@ -5290,9 +5684,8 @@ class squant(_single):
         f = lambda x: self._new(x, self.params)
         return f, self.v, other.v
 
-    @vectorize
     def __neg__(self):
-        return self._new(-self.v + 2 * util.expand(self.Z, self.v.size))
+        return self._new(-self.v + 2 * self.params.expanded_Z(self.v.size))
 
 class _unreduced_squant(Tape._no_truth):
     def __init__(self, v, params, res_params=None, n_summands=1):
@@ -5332,6 +5725,8 @@ class squant_params(object):
         self.Z = MemValue.if_necessary(Z)
         self.k = k
         self._store = {}
+        self._constant_store = {}
+        self._expanded_Z = {}
         if program.options.ring:
             # cheaper probabilistic truncation
             self.max_length = int(program.options.ring) - 1
@@ -5344,6 +5739,21 @@ class squant_params(object):
         yield self.Z
         yield self.k
 
+    def expanded_Z(self, size):
+        """ Zero point as vector, reused within the current block. """
+        if util.is_constant(self.Z):
+            return self.Z
+        block = program.curr_block
+        # writing Z replaces its register, which is kept here so that
+        # the identity check can't match a recycled object
+        register = getattr(self.Z, 'register', None)
+        if self._expanded_Z.get('block') is not block or \
+           self._expanded_Z.get('register') is not register:
+            self._expanded_Z = {'block': block, 'register': register}
+        if size not in self._expanded_Z:
+            self._expanded_Z[size] = util.expand(self.Z, size)
+        return self._expanded_Z[size]
+
     def is_constant(self):
         return util.is_constant_float(self.S) and util.is_constant(self.Z)
 
@@ -5370,8 +5780,13 @@ class squant_params(object):
     def reduce(self, unreduced):
         ps = (self,) + unreduced.params
         if reduce(operator.and_, (p.is_constant() for p in ps)):
-            n_shift, int_mult, shifted_Z = self.get(unreduced.params,
-                                                    unreduced.n_summands)
+            # only compile-time values, so no need to redo per reduction
+            key = unreduced.params, unreduced.n_summands
+            try:
+                n_shift, int_mult, shifted_Z = self._constant_store[key]
+            except KeyError:
+                n_shift, int_mult, shifted_Z = self._constant_store[key] = \
+                    self.get(unreduced.params, unreduced.n_summands)
         else:
             n_shift, int_mult, shifted_Z = self.get_stored(unreduced)
         size = unreduced.v.size
@@ -5387,8 +5802,8 @@ class squant_params(object):
             top = (1 << self.k) - 1
             over = shifted.greater_than(top, length)
             under = shifted.less_than(0, length)
-            shifted = over.if_else(top, shifted)
-            shifted = under.if_else(0, shifted)
+            # exclusive cases, so one multiplication replaces two muxes
+            shifted = shifted - (over + under) * shifted + over * top
         return squant._new(shifted, params=self)
 
 class sfloat(_number, _secret_structure):
@@ -5446,17 +5861,34 @@ class sfloat(_number, _secret_structure):
         """ Load from memory by public address. """
         size = get_global_vector_size()
         if cls.is_address_tuple(address):
-            return sfloat(*(sint.load_mem(a, size=size) for a in address))
-        res = []
-        for i in range(4):
-            res.append(sint.load_mem(address + i * size, size=size))
-        return sfloat(*res)
+            return cls._new(*(sint.load_mem(a, size=size) for a in address))
+        if isinstance(address, _register) and address.size == 1:
+            # one indirect access instead of four address computations
+            res = sint.load_mem(address, size=4 * size)
+            return cls._new(*(res.get_vector(i * size, size)
+                              for i in range(4)))
+        res = [sint.load_mem(address + i * size, size=size)
+               for i in range(4)]
+        if isinstance(address, _register):
+            # one gather per component, which determines the size
+            return sfloat(*res)
+        # direct loads need no address computation, and splitting one
+        # long load would cost an extra instruction per component
+        return cls._new(*res)
+
+    @classmethod
+    def _new(cls, v, p, z, s):
+        # fresh registers need not be copied as in __init__
+        res = cls.__new__(cls)
+        res.size = get_global_vector_size()
+        res.v, res.p, res.z, res.s = v, p, z, s
+        program.reading('floating-point numbers', 'ABZS13')
+        return res
 
     @classmethod
     def set_error(cls, error):
         # incompatible with loops
         #cls.error += error - cls.error * error
-        cls.error = error
         pass
 
     @classmethod
@@ -5481,7 +5913,11 @@ class sfloat(_number, _secret_structure):
             p = 0
             z = 1
         else:
-            p = int(math.floor(math.log(abs(v), 2))) - vlen + 1
+            # exact floor(log2(|v|)) + 1, unlike math.log
+            if isinstance(v, int):
+                p = abs(v).bit_length() - vlen
+            else:
+                p = math.frexp(abs(v))[1] - vlen
             vv = v
             v = int(round(abs(v) * 2 ** (-p)))
             if v == 2 ** vlen:
@@ -5517,23 +5953,24 @@ class sfloat(_number, _secret_structure):
             raise CompilerError(
                 'floating-point operations not supported with binary circuits')
         self.size = get_global_vector_size()
+        fresh = False
         if p is None:
             if isinstance(v, sfloat):
-                p = sint(v.p)
-                z = sint(v.z)
-                s = sint(v.s)
-                v = sint(v.v)
+                # copied once below
+                v, p, z, s = v
             elif isinstance(v, sfix):
                 f = v.f
                 v, p, z, s = floatingpoint.Int2FL(v.v, v.k,
                                                   self.vlen)
                 p = p - f
+                fresh = True
             elif util.is_constant_float(v):
                 v, p, z, s = self.convert_float(v, self.vlen, self.plen)
             else:
                 v, p, z, s = floatingpoint.Int2FL(sint.conv(v),
                                                   program.bit_length,
                                                   self.vlen)
+                fresh = True
         if isinstance(v, int):
             if not ((v >= 2**(self.vlen-1) and v < 2**(self.vlen)) or v == 0):
                 raise CompilerError('Floating point number malformed: significand')
@@ -5546,11 +5983,13 @@ class sfloat(_number, _secret_structure):
         if isinstance(s, int):
             if not (s == 0 or s == 1):
                 raise CompilerError('Floating point number malformed: sign')
-        # copying necessary for update to work properly
-        self.v = sint(v)
-        self.p = sint(p)
-        self.z = sint(z)
-        self.s = sint(s)
+        # copying necessary for update to work properly,
+        # unless the registers were just computed here
+        copy = lambda x: x if fresh and type(x) is sint else sint(x)
+        self.v = copy(v)
+        self.p = copy(p)
+        self.z = copy(z)
+        self.s = copy(s)
         program.reading('floating-point numbers', 'ABZS13')
 
     def __getitem__(self, index):
@@ -5568,8 +6007,13 @@ class sfloat(_number, _secret_structure):
             for a, x in zip(address, self):
                 x.store_in_mem(a)
             return
-        for i,x in enumerate((self.v, self.p, self.z, self.s)):
-            x.store_in_mem(address + i * self.size)
+        if isinstance(address, _register) and address.size > 1:
+            # one scatter per component
+            for i, x in enumerate(self):
+                x.store_in_mem(address + i * self.size)
+            return
+        # components are consecutive in memory
+        sint.concat(self).store_in_mem(address)
 
     def sizeof(self):
         return self.size * self.n_elements()
@@ -5592,14 +6036,20 @@ class sfloat(_number, _secret_structure):
             s2 = other.s
             z1 = self.z
             z2 = other.z
+            rn = sfloat.round_nearest
+            vlen = self.vlen
             a = p1.less_than(p2, self.plen)
             b = floatingpoint.EQZ(p1 - p2, self.plen)
-            c = v1.less_than(v2, self.vlen)
+            # |p1 - p2| too large, alongside the comparisons above
+            d1, d2 = sint(), sint()
+            limit = vlen + rn
+            comparison.LTZ(d1, limit - (p1 - p2), self.plen + 1)
+            comparison.LTZ(d2, limit + (p1 - p2), self.plen + 1)
+            d = d1 + d2
+            c = v1.less_than(v2, vlen)
             ap1 = a*p1
             ap2 = a*p2
-            aneg = 1 - a
             bneg = 1 - b
-            cneg = 1 - c
             av1 = a*v1
             av2 = a*v2
             cv1 = c*v1
@@ -5609,53 +6059,59 @@ class sfloat(_number, _secret_structure):
             vmax = bneg*(av2 + v1 - av1) + b*(cv2 + v1 - cv1)
             vmin = bneg*(av1 + v2 - av2) + b*(cv1 + v2 - cv2)
             s3 = s1 + s2 - 2 * s1 * s2
-            comparison.LTZ(d, self.vlen + pmin - pmax + sfloat.round_nearest,
-                           self.plen)
-            pow_delta = floatingpoint.Pow2((1 - d) * (pmax - pmin),
-                                           self.vlen + 1 + sfloat.round_nearest)
+            delta = (1 - d) * (pmax - pmin)
+            if program.options.ring:
+                pow_delta = floatingpoint.Pow2(delta, vlen + 1 + rn)
+            else:
+                # the inverse shares the bits and replaces Inv()
+                pow_delta, inv_delta = floatingpoint.Pow2AndInv(
+                    delta, vlen + 1 + rn)
             # deviate from paper for more precision
             #v3 = 2 * (vmax - s3) + 1
             v3 = vmax
             v4 = vmax * pow_delta + (1 - 2 * s3) * vmin
             to_trunc = (d * v3 + (1 - d) * v4)
             if program.options.ring:
-                to_trunc <<= 1 + sfloat.round_nearest
-                v = floatingpoint.TruncInRing(to_trunc,
-                                              2 * (self.vlen + 1 +
-                                                   sfloat.round_nearest),
+                to_trunc <<= 1 + rn
+                v = floatingpoint.TruncInRing(to_trunc, 2 * (vlen + 1 + rn),
                                               pow_delta)
             else:
-                to_trunc *= two_power(self.vlen + sfloat.round_nearest)
-                v = to_trunc * floatingpoint.Inv(pow_delta)
-                comparison.Trunc(t, v, 2 * self.vlen + 1 + sfloat.round_nearest,
-                                 self.vlen - 1, signed=False)
+                to_trunc *= two_power(vlen + rn)
+                v = to_trunc * inv_delta
+                comparison.Trunc(t, v, 2 * vlen + 1 + rn, vlen - 1,
+                                 signed=False)
                 v = t
-            u = floatingpoint.BitDec(v, self.vlen + 2 + sfloat.round_nearest,
-                                     self.vlen + 2 + sfloat.round_nearest,
-                                     list(range(1 + sfloat.round_nearest,
-                                           self.vlen + 2 + sfloat.round_nearest)))
+            u = floatingpoint.BitDec(v, vlen + 2 + rn, vlen + 2 + rn,
+                                     list(range(1 + rn, vlen + 2 + rn)))
             # using u[0] doesn't seem necessary
-            h = floatingpoint.PreOR(u[:sfloat.round_nearest:-1])
-            p0 = self.vlen + 1 - sum(h)
+            h = floatingpoint.PreOR(u[:rn:-1])
+            # the sum is zero if and only if all bits are, which saves
+            # testing the normalized result below
+            nonzero = floatingpoint.KOR([h[-1]] + u[:1 + rn])
+            p0 = vlen + 1 - sum(h)
             pow_p0 = 1 + sum([two_power(i) * (1 - h[i]) for i in range(len(h))])
-            if self.round_nearest:
+            if rn:
                 t2, overflow = \
-                    floatingpoint.TruncRoundNearestAdjustOverflow(pow_p0 * v,
-                                                                  self.vlen + 3,
-                                                                  self.vlen)
+                    floatingpoint.TruncRoundNearestAdjustOverflow(
+                        pow_p0 * v, vlen + 3, vlen)
                 p0 = p0 - overflow
             else:
-                comparison.Trunc(t2, pow_p0 * v, self.vlen + 2, 2, signed=False)
+                comparison.Trunc(t2, pow_p0 * v, vlen + 2, 2, signed=False)
             v = t2
             # deviate for more precision
             #p = pmax - p0 + 1 - d
             p = pmax - p0 + 1
             zz = self.z*other.z
             zprod = 1 - self.z - other.z + zz
-            v = zprod*t2 + self.z*v2 + other.z*v1
-            z = floatingpoint.EQZ(v, self.vlen)
-            p = (zprod*p + self.z*p2 + other.z*p1)*(1 - z)
-            s = (1 - b)*(a*other.s + aneg*self.s) + b*(c*other.s + cneg*self.s)
+            nz = zprod*nonzero
+            z = 1 - nz - self.z - other.z + 2*zz
+            v = nz*t2 + (self.z - zz)*v2 + (other.z - zz)*v1
+            p = nz*p + (self.z - zz)*p2 + (other.z - zz)*p1
+            # one multiplication per selection
+            s_diff = other.s - self.s
+            s_a = self.s + a*s_diff
+            s_c = self.s + c*s_diff
+            s = s_a + b*(s_c - s_a)
             s = zprod*s + (other.z - zz)*self.s + (self.z - zz)*other.s
             return sfloat(v, p, z, s)
         else:
@@ -5685,8 +6141,8 @@ class sfloat(_number, _secret_structure):
             z1, z2, s1, s2, p1, p2 = (x.expand_to_vector() for x in \
                                       (self.z, other.z, self.s, other.s,
                                        self.p, other.p))
-            z = z1 + z2 - self.z*other.z       # = OR(z1, z2)
-            s = s1 + s2 - self.s*other.s*2     # = XOR(s1,s2)
+            z = z1 + z2 - z1*z2                # = OR(z1, z2)
+            s = s1 + s2 - s1*s2*2              # = XOR(s1,s2)
             p = (p1 + p2 - b + self.vlen)*(1 - z)
             return sfloat(v2, p, z, s)
         else:
@@ -5707,6 +6163,14 @@ class sfloat(_number, _secret_structure):
         """ Secret floating-point division.
 
         :param other: sfloat/float/sfix/sint/cint/regint/int """
+        if util.is_constant_float(other) and other != 0:
+            # public divisor: multiply by the reciprocal instead, which
+            # rounds twice, unless the reciprocal isn't representable
+            inv = 1 / other
+            if inv != 0 and not math.isinf(inv) and \
+               -2 ** (self.plen - 1) <= math.frexp(inv)[1] - self.vlen \
+               < 2 ** (self.plen - 1):
+                return self * inv
         other = self.conv(other)
         v = floatingpoint.SDiv(self.v, other.v + other.z * (2**self.vlen - 1),
                                self.vlen, round_nearest=self.round_nearest)
@@ -5719,7 +6183,6 @@ class sfloat(_number, _secret_structure):
         p = (1 - self.z) * (self.p - other.p - self.vlen - b + 1)
         z = self.z
         s = self.s + other.s - 2 * self.s * other.s
-        sfloat.set_error(other.z)
         return sfloat(v, p, z, s)
 
     def __rtruediv__(self, other):
@@ -5729,7 +6192,8 @@ class sfloat(_number, _secret_structure):
     @vectorize
     def __neg__(self):
         """ Secret floating-point negation. """
-        return sfloat(self.v, self.p,  self.z, (1 - self.s) * (1 - self.z))
+        # the sign of zero is ignored, see __eq__
+        return sfloat(self.v, self.p,  self.z, 1 - self.s)
 
     @vectorize
     def __lt__(self, other):
@@ -5752,7 +6216,13 @@ class sfloat(_number, _secret_structure):
             b2 = cd + 1 + ca - c - a
             s12 = self.s*other.s
             z12 = self.z*other.z
-            b = (z1 - z12)*(1 - s2) + (z2 - z12)*s1 + (1 + z12 - z1 - z2)*(s1 - s12 + (1 + s12 - s1 - s2)*b1 + s12*b2)
+            # selectors not depending on the comparisons above,
+            # which saves a round after them
+            nonzero = 1 + z12 - z1 - z2
+            positive = nonzero*(1 + s12 - s1 - s2)
+            negative = nonzero*s12
+            b = (z1 - z12)*(1 - s2) + (z2 - z12)*s1 + nonzero*(s1 - s12) + \
+                positive*b1 + negative*b2
             return b
         else:
             return NotImplemented
@@ -5777,10 +6247,12 @@ class sfloat(_number, _secret_structure):
         other = self.conv(other)
         # the sign can be both ways for zeroes
         both_zero = self.z * other.z
+        # available before the zero tests, so only one more round after
+        same_sign = (1 - self.s - other.s + 2 * self.s * other.s) * \
+            (1 - both_zero)
         return floatingpoint.EQZ(self.v - other.v, self.vlen) * \
             floatingpoint.EQZ(self.p - other.p, self.plen) * \
-            (1 - self.s - other.s + 2 * self.s * other.s) * \
-            (1 - both_zero) + both_zero
+            same_sign + both_zero
 
     def __ne__(self, other):
         """ Secret floating-point comparison. """
@@ -5972,6 +6444,7 @@ class Array(_vectorizable):
         self.value_type = value_type
         self.address = address
         self.address_cache = {}
+        self.matrix_views = {}
         self.debug = debug
         self.creator_tape = program.curr_tape
         self.sink = None
@@ -6005,9 +6478,12 @@ class Array(_vectorizable):
     def get_address(self, index, size=None):
         if isinstance(index, (_secret, _single)):
             raise CompilerError('need cleartext index')
-        key = str(index), size or 1
-        index = self.check(index, self.length, self.length)
+        # str() keeps other objects apart but is costly for plain ints
+        key = index if isinstance(index, int) else str(index), size or 1
         if (program.curr_block, key) not in self.address_cache:
+            # like the address, the bounds check only needs to be
+            # done once per block
+            index = self.check(index, self.length, self.length)
             n = self.value_type.n_elements()
             length = self.length
             if n == 1:
@@ -6025,6 +6501,16 @@ class Array(_vectorizable):
                 library.print_ln_if(self.address_cache[program.curr_block, key] >= program.allocated_mem[self.value_type.reg_type], 'AOF:' + self.debug)
         return self.address_cache[program.curr_block, key]
 
+    def _inc(self, *args):
+        """ :py:func:`regint.inc` reused within the current block for
+        compile-time arguments. """
+        if not all(isinstance(x, int) for x in args):
+            return regint.inc(*args)
+        key = program.curr_block, 'inc', args
+        if key not in self.address_cache:
+            self.address_cache[key] = regint.inc(*args)
+        return self.address_cache[key]
+
     def get_slice(self, index):
         if index.stop is None and self.length is None:
             raise CompilerError('Cannot slice array of unknown length')
@@ -6045,7 +6531,7 @@ class Array(_vectorizable):
                 return self.get_vector(start, stop - start)
             else:
                 res_length = (stop - start - 1) // step + 1
-                addresses = regint.inc(res_length, start, step)
+                addresses = self._inc(res_length, start, step)
                 return self.get_vector(addresses, res_length)
         return self._load(self.get_address(index))
 
@@ -6060,7 +6546,7 @@ class Array(_vectorizable):
                 return self.assign(value, start)
             else:
                 res_length = (stop - start - 1) // step + 1
-                addresses = regint.inc(res_length, start, step)
+                addresses = self._inc(res_length, start, step)
                 return self.assign(value, addresses)
         self._store(value, self.get_address(index))
 
@@ -6100,9 +6586,23 @@ class Array(_vectorizable):
     # the following two are useful for compile-time lengths
     # and thus differ from the usual Python syntax
     def get_range(self, start, size):
+        if util.is_constant(size) and size > 1 and \
+           issubclass(self.value_type, (_register, _fix)):
+            # one vector load, the elements are views of its registers
+            vec = self.get_vector(start, size)
+            return [vec[i] for i in range(size)]
         return [self[start + i] for i in range(size)]
 
     def set_range(self, start, values):
+        values = list(values)
+        if len(values) > 1 and issubclass(self.value_type, (sint, sfix)) and \
+           all(isinstance(v, self.value_type) and v.size == 1 and
+               getattr(v, 'f', None) == getattr(values[0], 'f', None) and
+               getattr(v, 'k', None) == getattr(values[0], 'k', None)
+               for v in values):
+            # single concatenation and store
+            self.assign(self.value_type.concat(values), base=start)
+            return
         for i, value in enumerate(values):
             self[start + i] = value
 
@@ -6129,8 +6629,15 @@ class Array(_vectorizable):
         return [self.length]
 
     def __iter__(self):
-        for i in range(self.length):
-            yield self[i]
+        if isinstance(self.address, int) and \
+           self.value_type.n_elements() == 1:
+            # compile-time addresses without the cache
+            mem_size = self.value_type.mem_size()
+            for i in range(self.length):
+                yield self._load(self.address + i * mem_size)
+        else:
+            for i in range(self.length):
+                yield self[i]
 
     def same_shape(self, **kwargs):
         """ Array of same length and type. """
@@ -6181,6 +6688,11 @@ class Array(_vectorizable):
         if not util.is_constant(self.length) or program.options.garbled or \
            not program.curr_tape.singular:
             n_threads = None
+        if use_vector and n_threads is None and \
+           util.is_constant(self.length) and self.length <= program.budget:
+            # single store without the loop machinery
+            self.assign_vector(self.value_type(value, size=self.length))
+            return self
         if n_threads is not None:
             self.address = MemValue.if_necessary(self.address)
         @library.multithread(n_threads, self.length, max_size=program.budget)
@@ -6210,7 +6722,7 @@ class Array(_vectorizable):
     def get_reverse_vector(self):
         """ Return vector with content in reverse order. """
         size = self.length
-        address = regint.inc(size, size - 1, -1)
+        address = self._inc(size, size - 1, -1)
         return self.value_type.load_mem(self.address + address, size=size)
 
     def get_part(self, base, size):
@@ -6228,15 +6740,15 @@ class Array(_vectorizable):
         :param indices: regint vector or array
         """
         return self.value_type.load_mem(
-            regint.inc(len(indices), self.address, 0) + indices,
+            self._inc(len(indices), self.address, 0) + indices,
             size=len(indices))
 
     def get_slice_addresses(self, slice):
         assert self.value_type.n_elements() == 1
         assert len(slice) <= self.total_size()
-        base = regint.inc(len(slice), slice.address, 1, 1)
-        inc = regint.inc(len(slice), self.address, 1, 1, 1)
-        addresses = regint.conv(slice.value_type.load_mem(base)) + inc
+        inc = self._inc(len(slice), self.address, 1, 1, 1)
+        # the indices are contiguous, so a direct load suffices
+        addresses = regint.conv(slice.get_vector()) + inc
         return addresses
 
     def get_slice_vector(self, slice):
@@ -6278,8 +6790,9 @@ class Array(_vectorizable):
         """ Concatenate two arrays. """
         assert self.value_type == other.value_type
         res = Array(len(self) + len(other), self.value_type)
-        res.assign_vector(self[:])
-        res.assign_vector(other[:], len(self))
+        # direct vector copies without going through slicing
+        res.assign_vector(self.get_vector())
+        res.assign_vector(other.get_vector(), len(self))
         return res
 
     def input_from(self, player, budget=None, raw=False, **kwargs):
@@ -6317,14 +6830,20 @@ class Array(_vectorizable):
         :returns: destination for final position, -1 for eof reached,
              or -2 for file not found (regint)
         """
+        if util.is_constant(len(self)) and len(self) <= program.budget:
+            # single request without position bookkeeping
+            stop, shares = self.value_type.read_from_file(
+                start, *args, size=len(self), **kwargs)
+            self.assign(shares[0])
+            return MemValue(stop)
         start = regint(start)
         res = MemValue(0)
         @library.multithread(None, len(self), max_size=program.budget)
         def _(base, size):
+            # chunk positions follow from the base without a running sum
             stop, shares = self.value_type.read_from_file(
-                start, *args, size=size, **kwargs)
+                start + base, *args, size=size, **kwargs)
             self.assign(shares[0], base=base)
-            start.iadd(size)
             res.write(stop)
         return res
 
@@ -6336,14 +6855,16 @@ class Array(_vectorizable):
         :param position: start position (int/regint/cint),
             defaults to end of file
         """
+        if util.is_constant(len(self)) and len(self) <= program.budget:
+            self.value_type.write_to_file(self.get_vector(), position)
+            return
         if position is not None:
             position = regint(position)
         @library.multithread(None, len(self), max_size=program.budget)
         def _(base, size):
-            self.value_type.write_to_file(self.get_vector(base=base, size=size),
-                                          position)
-            if position is not None:
-                position.iadd(size)
+            self.value_type.write_to_file(
+                self.get_vector(base=base, size=size),
+                None if position is None else position + base)
 
     def read_from_socket(self, socket, debug=False):
         """ Read content from socket. """
@@ -6361,7 +6882,8 @@ class Array(_vectorizable):
         """ Write content to socket. """
         if debug:
             library.print_ln('writing %s' % self)
-        # hard-coded budget for interopability
+        # hard-coded budget for interopability, the other side expects
+        # one message per chunk, so chunks cannot be coalesced
         @library.multithread(None, len(self), max_size=10 ** 6)
         def _(base, size):
             self.value_type.write_to_socket(
@@ -6427,19 +6949,19 @@ class Array(_vectorizable):
     __rmul__ = __mul__
 
     def __iadd__(self, other):
-        self[:] += other.get_vector()
+        self.assign(self.get_vector() + other.get_vector())
         return self
 
     def __isub__(self, other):
-        self[:] -= other.get_vector()
+        self.assign(self.get_vector() - other.get_vector())
         return self
 
     def __imul__(self, other):
-        self[:] *= other.get_vector()
+        self.assign(self.get_vector() * other.get_vector())
         return self
 
     def __itruediv__(self, other):
-        self[:] /= other.get_vector()
+        self.assign(self.get_vector() / other.get_vector())
         return self
 
     def __neg__(self):
@@ -6447,8 +6969,18 @@ class Array(_vectorizable):
 
     def dot(self, other):
         """ Dot product with another array. """
-        M = Matrix(1, len(self), self.value_type, address=self.address)
-        return M.dot(other)
+        return self._matrix_view(1, len(self)).dot(other)
+
+    def _matrix_view(self, rows, columns):
+        """ Matrix sharing the memory, reused for compile-time
+        addresses. """
+        if not isinstance(self._address, int):
+            return Matrix(rows, columns, self.value_type, address=self.address)
+        key = rows, columns, self._address
+        if key not in self.matrix_views:
+            self.matrix_views[key] = Matrix(rows, columns, self.value_type,
+                                            address=self._address)
+        return self.matrix_views[key]
 
     def shuffle(self):
         """ Insecure shuffle in place. """
@@ -6503,7 +7035,8 @@ class Array(_vectorizable):
             library.print_str('%s' + end, self.get_vector().reveal())
         else:
             library.print_str('[')
-            @library.for_range(self.length - 1)
+            # merge openings across iterations, printing stays in order
+            @library.for_range_opt(self.length - 1)
             def _(i):
                 library.print_str('%s, ', self[i].reveal())
             library.print_str('%s', self[self.length - 1].reveal())
@@ -6573,7 +7106,7 @@ class Array(_vectorizable):
         """
         assert self.value_type.n_elements() == 1 and \
                self.value_type.mem_size() == 1
-        return Matrix(1, self.length, self.value_type, address=self.address)
+        return self._matrix_view(1, self.length)
 
     def to_column_matrix(self):
         """
@@ -6584,7 +7117,7 @@ class Array(_vectorizable):
         """
         assert self.value_type.n_elements() == 1 and \
                self.value_type.mem_size() == 1
-        return Matrix(self.length, 1, self.value_type, address=self.address)
+        return self._matrix_view(self.length, 1)
 
     def Array(self, size):
         # compatibility with registers
@@ -6609,17 +7142,27 @@ class SubMultiArray(_vectorizable):
     def __init__(self, sizes, value_type, address, index, debug=None):
         self.sizes = tuple(sizes)
         self.value_type = _get_type(value_type)
+        # the shape is fixed, so the products only need computing once,
+        # entries per step in each dimension
+        self._strides = tuple(reduce(operator.mul, self.sizes[i + 1:], 1)
+                              for i in range(len(self.sizes)))
+        self._part_size = self._strides[0]
+        self._total_size = self.sizes[0] * self._part_size * \
+            self.value_type.n_elements()
         if address is not None:
             if not util.is_zero(index):
-                self.address = address + index * self.total_size()
+                self.address = address + index * self._total_size
             else:
                 self.address = address
         else:
             self.address = None
         self.sub_cache = {}
+        self.address_cache = {}
         self.debug = debug
         if debug:
-            library.print_ln_if(self.address + reduce(operator.mul, self.sizes) * self.value_type.n_elements() > program.allocated_mem[self.value_type.reg_type], 'AOF%d:' % len(self.sizes) + self.debug)
+            library.print_ln_if(self.address + self._total_size > program.allocated_mem[self.value_type.reg_type], 'AOF%d:' % len(self.sizes) + self.debug)
+
+    _inc = Array._inc
 
     @read_mem_value
     def __getitem__(self, index):
@@ -6631,14 +7174,18 @@ class SubMultiArray(_vectorizable):
             return self.get_vector()
         if isinstance(index, int) and index < 0:
             index += self.sizes[0]
-        key = program.curr_tape, tuple(
-            (x, x.has_else) for x in program.curr_tape.if_states), str(index)
+        tape = program.curr_tape
+        if tape.if_states:
+            states = tuple((x, x.has_else) for x in tape.if_states)
+        else:
+            states = ()
+        key = tape, states, index if isinstance(index, int) else str(index)
         if key not in self.sub_cache:
             index = self.check(index, self.sizes[0], self.sizes)
             if len(self.sizes) == 2:
                 self.sub_cache[key] = \
                         Array(self.sizes[1], self.value_type, \
-                              self.address + index * self.sizes[1] *
+                              self.address + index * self._part_size *
                               self.value_type.n_elements() * \
                               self.value_type.mem_size(), \
                               debug=self.debug)
@@ -6668,12 +7215,15 @@ class SubMultiArray(_vectorizable):
         return list(self.sizes)
 
     def __iter__(self):
-        return (self[i] for i in range(len(self)))
+        # parts come from the cache in __getitem__, which keeps them
+        # identical across accesses and separate between if branches
+        getitem = self.__getitem__
+        return (getitem(i) for i in range(len(self)))
 
     def to_array(self):
         assert self.value_type.n_elements() == 1 and \
             self.value_type.mem_size() == 1
-        return Array(self.total_size(), self.value_type, address=self.address)
+        return Array(self._total_size, self.value_type, address=self.address)
 
     def maybe_get(self, condition, index):
         return self[condition * index]
@@ -6689,36 +7239,71 @@ class SubMultiArray(_vectorizable):
         try:
             self.to_array().assign_all(value)
         except AssertionError:
+            if issubclass(self.value_type, sfloat) and \
+               self._total_size <= program.budget:
+                # fill the first row and double the filled part by
+                # copying the underlying memory
+                self[0].assign_all(value)
+                row = self._part_size * self.value_type.n_elements()
+                done = 1
+                while done < self.sizes[0]:
+                    n = min(done, self.sizes[0] - done)
+                    sint.load_mem(self.address, size=n * row).store_in_mem(
+                        self.address + done * row)
+                    done += n
+                return self
             @library.for_range(self.sizes[0])
             def f(i):
                 self[i].assign_all(value)
         return self
 
     def total_size(self):
-        return reduce(operator.mul, self.sizes) * self.value_type.n_elements()
+        return self._total_size
 
     def part_size(self):
-        return reduce(operator.mul, self.sizes[1:]) * \
-            self.value_type.n_elements()
+        return self._part_size * self.value_type.n_elements()
 
     def get_vector(self, base=0, size=None):
-        """ Return vector with content. Not implemented for floating-point.
+        """ Return vector with content. Floating-point is only supported
+        for the whole content.
 
         :param base: public (regint/cint/int)
         :param size: compile-time (int) """
-        assert self.value_type.n_elements() == 1
-        size = size or self.total_size()
+        if self.value_type.n_elements() > 1:
+            assert util.is_zero(base) and size is None
+            return self.value_type.load_mem(self._component_addresses(),
+                                            size=self._part_size * self.sizes[0])
+        size = size or self._total_size
         return self.value_type.load_mem(self.address + base, size=size)
 
     def assign_vector(self, vector, base=0):
-        """ Assign vector to content. Not implemented for floating-point.
+        """ Assign vector to content. Floating-point is only supported
+        for the whole content.
 
         :param vector: vector of matching size convertible to relevant basic type
         :param base: compile-time (int) """
-        assert self.value_type.n_elements() == 1
-        assert vector.size <= self.total_size()
+        if self.value_type.n_elements() > 1:
+            assert util.is_zero(base)
+            assert vector.size == self._part_size * self.sizes[0]
+            self.value_type.conv(vector).store_in_mem(
+                self._component_addresses())
+            return
+        assert vector.size <= self._total_size
         self.value_type.conv(vector).store_in_mem(self.address + base)
 
+    def _component_addresses(self):
+        """ Addresses of each component of all entries in order. Every
+        row in the last dimension stores its components one after
+        another, so one indirect access per component covers the whole
+        content. """
+        assert self.value_type.mem_size() == 1
+        n = self.value_type.n_elements()
+        row = self.sizes[-1]
+        size = self._part_size * self.sizes[0]
+        addresses = self._inc(size, self.address, n * row, row) + \
+            self._inc(size, 0, 1, 1, row)
+        return tuple(addresses + i * row for i in range(n))
+
     def assign(self, other, base=0):
         """ Assign container to content. Not implemented for floating-point.
 
@@ -6739,9 +7324,9 @@ class SubMultiArray(_vectorizable):
         :param size: size in first dimension (int)
         """
         assert self.value_type.n_elements() == 1
-        part_size = reduce(operator.mul, self.sizes[1:])
+        part_size = self._part_size
         size = (size or 1) * part_size
-        assert size <= self.total_size()
+        assert size <= self._total_size
         return self.value_type.load_mem(self.address + base * part_size,
                                         size=size)
 
@@ -6753,8 +7338,8 @@ class SubMultiArray(_vectorizable):
         :param base: index in first dimension (regint/cint/int)
         """
         assert self.value_type.n_elements() == 1
-        part_size = reduce(operator.mul, self.sizes[1:])
-        assert vector.size <= self.total_size()
+        part_size = self._part_size
+        assert vector.size <= self._total_size
         vector.store_in_mem(self.address + base * part_size)
 
     def get_slice_vector(self, slice):
@@ -6772,11 +7357,13 @@ class SubMultiArray(_vectorizable):
 
     def get_part_size(self):
         assert self.value_type.n_elements() == 1
-        return reduce(operator.mul, self.sizes[1:]) * self.value_type.mem_size()
+        return self._part_size * self.value_type.mem_size()
 
     def get_slice_addresses(self, slice, part_size=None):
         part_size = part_size or self.get_part_size()
-        assert len(slice) * part_size <= self.total_size()
+        assert len(slice) * part_size <= self._total_size
+        if part_size == 1:
+            return slice.get_vector()
         base = regint.inc(len(slice) * part_size, slice.address, 1, part_size)
         inc = regint.inc(len(slice) * part_size, 0, 1, 1, part_size)
         addresses = slice.value_type.load_mem(base) * part_size + inc
@@ -6790,6 +7377,14 @@ class SubMultiArray(_vectorizable):
         :param reverse: whether to apply the inverse of the permutation
 
         """
+        if n_threads is None and util.is_constant(self._total_size) and \
+           self._total_size <= program.budget:
+            # one gather or scatter of the whole content
+            if reverse:
+                self.assign_slice_vector(permutation, self.get_vector())
+            else:
+                self.assign_vector(self.get_slice_vector(permutation))
+            return
         @library.multithread(n_threads, self.get_part_size())
         def _(base, size):
             addresses = self.get_slice_addresses(permutation, part_size=1)
@@ -6814,7 +7409,7 @@ class SubMultiArray(_vectorizable):
         has_glob = False
         last_was_glob = False
         for i, x in enumerate(indices):
-            part_size = reduce(operator.mul, (1,) + self.sizes[i + 1:])
+            part_size = self._strides[i]
             if x is None:
                 assert not has_glob or last_was_glob
                 has_glob = True
@@ -6869,15 +7464,15 @@ class SubMultiArray(_vectorizable):
         assert self.value_type == other.value_type
         res = MultiArray((self.sizes[0] + other.sizes[0],) + self.sizes[1:],
                          self.value_type)
-        res.assign_vector(self[:])
-        res.assign_part_vector(other[:], self.sizes[0])
+        res.assign_vector(self.get_vector())
+        res.assign_part_vector(other.get_vector(), self.sizes[0])
         return res
 
     def input_from(self, player, budget=None, raw=False, **kwargs):
         """ Fill with inputs from player if supported by type.
 
         :param player: public (regint/cint/int) """
-        if util.is_constant(self.total_size()) and \
+        if util.is_constant(self._total_size) and \
            self.value_type.n_elements() == 1 and \
            self.value_type.mem_size() == 1:
             self.to_array().input_from(player, budget=budget, raw=raw, **kwargs)
@@ -6894,6 +7489,10 @@ class SubMultiArray(_vectorizable):
         :param position: start position (int/regint/cint),
             defaults to end of file
         """
+        if self.value_type.n_elements() == 1 and \
+           self.value_type.mem_size() == 1:
+            # rows are contiguous, so this is the same as a flat array
+            return self.to_array().write_to_file(position)
         @library.for_range(len(self))
         def _(i):
             if position is None:
@@ -6913,6 +7512,9 @@ class SubMultiArray(_vectorizable):
         :returns: destination for final position, -1 for eof reached,
              or -2 for file not found (regint)
         """
+        if self.value_type.n_elements() == 1 and \
+           self.value_type.mem_size() == 1:
+            return self.to_array().read_from_file(start, *args, **kwargs)
         start = MemValue(start)
         @library.for_range(len(self))
         def _(i):
@@ -6974,29 +7576,29 @@ class SubMultiArray(_vectorizable):
         return self.from_vector(
             self.sizes, self.get_vector() - other.get_vector())
 
+    def _compare(self, op, other):
+        if isinstance(other, _vectorizable):
+            assert self.sizes == other.sizes
+            other = other.get_vector()
+        return self.from_vector(self.sizes, op(self.get_vector(), other))
+
     def __eq__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() == other)
+        return self._compare(operator.eq, other)
 
     def __ne__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() != other)
+        return self._compare(operator.ne, other)
 
     def __lt__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() < other)
+        return self._compare(operator.lt, other)
 
     def __le__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() <= other)
+        return self._compare(operator.le, other)
 
     def __gt__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() > other)
+        return self._compare(operator.gt, other)
 
     def __ge__(self, other):
-        return self.from_vector(
-            self.sizes, self.get_vector() >= other)
+        return self._compare(operator.ge, other)
 
     def iadd(self, other):
         """ Element-wise addition in place.
@@ -7006,19 +7608,19 @@ class SubMultiArray(_vectorizable):
         self.assign_vector(self.get_vector() + other.get_vector())
 
     def __iadd__(self, other):
-        self[:] += other.get_vector()
+        self.assign(self.get_vector() + other.get_vector())
         return self
 
     def __isub__(self, other):
-        self[:] -= other.get_vector()
+        self.assign(self.get_vector() - other.get_vector())
         return self
 
     def __imul__(self, other):
-        self[:] *= other.get_vector()
+        self.assign(self.get_vector() * other.get_vector())
         return self
 
     def __itruediv__(self, other):
-        self[:] /= other.get_vector()
+        self.assign(self.get_vector() / other.get_vector())
         return self
 
     def __mul__(self, other):
@@ -7037,6 +7639,9 @@ class SubMultiArray(_vectorizable):
         :param n_threads: number of threads (default: all in same thread)
         :rtype: Matrix or Array of appropriate size and type
 
+        The result is stored, so fixed-point entries are always
+        truncated. See :py:func:`direct_mul` for an unreduced result.
+
         """
         assert len(self.sizes) == 2
         if isinstance(other, Array):
@@ -7048,11 +7653,11 @@ class SubMultiArray(_vectorizable):
                 return Array(res.sizes[0], res.value_type, address=res.address)
             else:
                 matrix = Matrix(len(other), 1, other.value_type)
-                for i, x in enumerate(other):
-                    matrix[i][0] = x
+                matrix.assign_vector(other.get_vector())
                 res = self * matrix
                 library.break_point()
-                return Array.create_from(x[0] for x in res)
+                return Array(res.sizes[0], res.value_type).assign_vector(
+                    res.get_vector())
         elif isinstance(other, SubMultiArray):
             assert len(other.sizes) == 2
             assert other.sizes[0] == self.sizes[1]
@@ -7107,14 +7712,26 @@ class SubMultiArray(_vectorizable):
                             self[i], other, res_params)
                     except (AttributeError, CompilerError):
                         # fallback for binary circuits
-                        @library.for_range_opt(other.sizes[1])
-                        def _(j):
-                            tmp = self[i][0].mul_no_reduce(other[0][j])
-                            @library.for_range_opt(1, self.sizes[1])
-                            def _(k):
-                                prod = self[i][k].mul_no_reduce(other[k][j])
-                                tmp.iadd(prod)
-                            res_matrix[i][j] = tmp.reduce_after_mul()
+                        if self.sizes[1] * other.sizes[1] <= program.budget:
+                            # unrolled for small shapes, so that the
+                            # products of a row share rounds
+                            row = self[i]
+                            for j in range(other.sizes[1]):
+                                res_matrix[i][j] = util.tree_reduce(
+                                    operator.add,
+                                    [row[k].mul_no_reduce(other[k][j])
+                                     for k in range(self.sizes[1])]). \
+                                     reduce_after_mul()
+                        else:
+                            @library.for_range_opt(other.sizes[1])
+                            def _(j):
+                                tmp = self[i][0].mul_no_reduce(other[0][j])
+                                @library.for_range_opt(1, self.sizes[1])
+                                def _(k):
+                                    prod = self[i][k].mul_no_reduce(
+                                        other[k][j])
+                                    tmp.iadd(prod)
+                                res_matrix[i][j] = tmp.reduce_after_mul()
             return res_matrix
         elif isinstance(other, self.value_type):
             return self * Array.create_from(other)
@@ -7128,6 +7745,7 @@ class SubMultiArray(_vectorizable):
 
         :param self: :py:class:`Matrix` / 2-dimensional :py:class:`MultiArray`
         :param other: :py:class:`Matrix` / 2-dimensional :py:class:`MultiArray`
+        :param reduce: whether to truncate fixed-point results (default: true); use false to defer this to :py:func:`reduce_after_mul` on the result, for example after further additions
         :param indices: 4-tuple of :py:class:`regint` vectors for index selection (default is complete multiplication)
         :return: Matrix as vector of relevant type (row-major)
 
@@ -7178,7 +7796,7 @@ class SubMultiArray(_vectorizable):
             return self.dot(other.transpose())[:]
         if indices is None:
             assert self.sizes[1] == other.sizes[1]
-            indices = [regint.inc(i) for i in self.sizes + other.sizes[::-1]]
+            indices = [self._inc(i) for i in self.sizes + other.sizes[::-1]]
         assert len(indices[1]) == len(indices[2])
         indices = list(indices)
         indices[3] *= other.sizes[1]
@@ -7204,7 +7822,7 @@ class SubMultiArray(_vectorizable):
             return self.transpose().dot(other)[:]
         if indices is None:
             assert self.sizes[0] == other.sizes[0]
-            indices = [regint.inc(i) for i in self.sizes[::-1] + other.sizes]
+            indices = [self._inc(i) for i in self.sizes[::-1] + other.sizes]
         assert len(indices[1]) == len(indices[2])
         indices = list(indices)
         indices[1] *= self.sizes[1]
@@ -7229,10 +7847,14 @@ class SubMultiArray(_vectorizable):
         if program.options.binary:
             res[:] = self.transpose().dot(other)
             return
+        if n_threads is None and res.total_size() <= program.budget:
+            # one multiplication for the whole result
+            res.assign_vector(self.direct_trans_mul(other))
+            return
         @library.for_range_multithread(n_threads, 1, self.sizes[1])
         def _(i):
-            indices = [regint(i), regint.inc(self.sizes[0])]
-            indices += [regint.inc(i) for i in other.sizes]
+            indices = [regint(i), self._inc(self.sizes[0])]
+            indices += [self._inc(i) for i in other.sizes]
             res[i] = self.direct_trans_mul(other, indices=indices)
 
     def mul_trans_to(self, other, res, n_threads=None):
@@ -7252,10 +7874,13 @@ class SubMultiArray(_vectorizable):
         if program.options.binary:
             res[:] = self.dot(other.transpose())
             return
+        if n_threads is None and res.total_size() <= program.budget:
+            res.assign_vector(self.direct_mul_trans(other))
+            return
         @library.for_range_multithread(n_threads, 1, self.sizes[0])
         def _(i):
-            indices = [regint(i), regint.inc(self.sizes[1])]
-            indices += [regint.inc(i) for i in reversed(other.sizes)]
+            indices = [regint(i), self._inc(self.sizes[1])]
+            indices += [self._inc(i) for i in reversed(other.sizes)]
             res[i] = self.direct_mul_trans(other, indices=indices)
 
     def direct_mul_to_matrix(self, other):
@@ -7269,6 +7894,9 @@ class SubMultiArray(_vectorizable):
 
     def mul_trans(self, other):
         """ Matrix multiplication with transpose of :py:obj:`other`.
+        Use :py:func:`mul_trans_to` to write into an existing matrix
+        or :py:func:`direct_mul_trans` for a vector without
+        intermediate storage.
 
         :param self: two-dimensional
         :param other: two-dimensional container of matching type and size
@@ -7280,7 +7908,10 @@ class SubMultiArray(_vectorizable):
         return res
 
     def trans_mul(self, other):
-        """ Matrix multiplication with transpose of :py:obj:`self`
+        """ Matrix multiplication with transpose of :py:obj:`self`.
+        Use :py:func:`trans_mul_to` to write into an existing matrix
+        or :py:func:`direct_trans_mul` for a vector without
+        intermediate storage.
 
         :param self: two-dimensional
         :param other: two-dimensional container of matching type and size
@@ -7297,19 +7928,27 @@ class SubMultiArray(_vectorizable):
         assert len(other.sizes) == 2
         assert self.value_type.n_elements() == 1
         n = self.sizes[0] * other.sizes[1]
-        a = []
-        b = []
-        for i in range(self.sizes[1]):
-            addresses = regint(size=n)
-            incint(addresses, regint(self.address + i), self.sizes[1],
-                   other.sizes[1], n)
-            a.append(self.value_type.load_mem(addresses, size=n))
-            addresses = regint(size=n)
-            incint(addresses, regint(other.address + i * other.sizes[1]), 1,
-                   1, other.sizes[1])
-            b.append(self.value_type.load_mem(addresses, size=n))
-        res = self.value_type.dot_product(a, b)
-        return res
+        if issubclass(self.value_type, (sint, sfix)):
+            # one gather per operand, split locally
+            size = self.sizes[1] * n
+            A = self.value_type.load_mem(
+                self._inc(size, self.address, 1, n) +
+                self._inc(size, 0, self.sizes[1], other.sizes[1],
+                          self.sizes[0]), size=size)
+            B = self.value_type.load_mem(
+                other._inc(size, other.address, other.sizes[1], n) +
+                self._inc(size, 0, 1, 1, other.sizes[1]), size=size)
+            a = [A.get_vector(i * n, n) for i in range(self.sizes[1])]
+            b = [B.get_vector(i * n, n) for i in range(self.sizes[1])]
+        else:
+            a = [self.value_type.load_mem(regint.inc(
+                n, self.address + i, self.sizes[1], other.sizes[1]))
+                 for i in range(self.sizes[1])]
+            b = [self.value_type.load_mem(regint.inc(
+                n, other.address + i * other.sizes[1], 1, 1, other.sizes[1]))
+                 for i in range(self.sizes[1])]
+        # dotprods reduces all pairs in the virtual machine
+        return self.value_type.dot_product(a, b)
 
     def get_column(self, index):
         """ Get matrix column as vector.
@@ -7317,9 +7956,9 @@ class SubMultiArray(_vectorizable):
         :param index: regint/cint/int
         """
         assert self.value_type.n_elements() == 1
-        addresses = regint.inc(self.sizes[0], self.address + \
-                               index * self.value_type.mem_size(),
-                               self.get_part_size())
+        addresses = self._inc(self.sizes[0], self.address + \
+                              index * self.value_type.mem_size(),
+                              self.get_part_size())
         return self.value_type.load_mem(addresses)
 
     def set_column(self, index, vector):
@@ -7329,9 +7968,9 @@ class SubMultiArray(_vectorizable):
         :param vector: short enought vector of compatible type
         """
         assert self.value_type.n_elements() == 1
-        addresses = regint.inc(self.sizes[0], self.address + \
-                               index * self.value_type.mem_size(),
-                               self.get_part_size())
+        addresses = self._inc(self.sizes[0], self.address + \
+                              index * self.value_type.mem_size(),
+                              self.get_part_size())
         self.value_type.conv(vector).store_in_mem(addresses)
 
     def transpose(self, n_threads=None):
@@ -7341,22 +7980,35 @@ class SubMultiArray(_vectorizable):
         assert len(self.sizes) == 2
         res = Matrix(self.sizes[1], self.sizes[0], self.value_type)
         library.break_point('pre-transpose')
-        if self.value_type.n_elements() == 1 and not program.options.binary:
-            if self.sizes[0] < program.budget:
-                if self.sizes[1] < program.budget:
-                    nr = self.sizes[1]
-                    nc = self.sizes[0]
-                    a = regint.inc(nr * nc, 0, nr, 1, nc)
-                    b = regint.inc(nr * nc, 0, 1, nc)
-                    res[:] = self.value_type.load_mem(self.address + a + b)
-                else:
-                    @library.for_range_multithread(n_threads, 1, self.sizes[0])
-                    def _(i):
-                        res.set_column(i, self[i][:])
-            else:
-                @library.for_range_multithread(n_threads, 1, self.sizes[1])
-                def _(i):
-                    res[i][:] = self.get_column(i)
+        nr, nc = self.sizes
+        binary = program.options.binary
+        single = self.value_type.n_elements() == 1 and not binary
+        if single and nr < program.budget and nc < program.budget:
+            # incint only has one stride, so two patterns are needed,
+            # but the base address can go into the first
+            a = self._inc(nr * nc, self.address, nc, 1, nr)
+            b = self._inc(nr * nc, 0, 1, nr)
+            res[:] = self.value_type.load_mem(a + b)
+        elif single and nr < program.budget:
+            @library.for_range_multithread(n_threads, 1, nr)
+            def _(i):
+                res.set_column(i, self[i][:])
+        elif single and nc < program.budget:
+            @library.for_range_multithread(n_threads, 1, nc)
+            def _(i):
+                res[i][:] = self.get_column(i)
+        elif single:
+            self._tiled_transpose(res, n_threads)
+        elif self.value_type.n_elements() > 1 and \
+             self.value_type.mem_size() == 1 and not binary and \
+             self._total_size <= program.budget:
+            # gather all in transposed order with one indirect load
+            # per component, see _component_addresses()
+            n = self.value_type.n_elements()
+            addresses = self._inc(nr * nc, self.address, 1, nr) + \
+                self._inc(nr * nc, 0, n * nc, 1, nr)
+            res.assign_vector(self.value_type.load_mem(
+                tuple(addresses + i * nc for i in range(n)), size=nr * nc))
         else:
             @library.for_range_opt_multithread(n_threads, self.sizes[1],
                                                budget=100)
@@ -7367,18 +8019,52 @@ class SubMultiArray(_vectorizable):
         library.break_point('post-transpose')
         return res
 
+    def _tiled_transpose(self, res, n_threads=None):
+        # square tiles within the budget so that neither side is
+        # accessed with a large stride only
+        nr, nc = self.sizes
+        tile = int(program.budget ** .5)
+        def tiles(r0, n_r, h, c0, n_c, w):
+            if not (n_r and n_c):
+                return
+            @library.for_range_multithread(n_threads, 1, n_r)
+            def _(i):
+                @library.for_range(n_c)
+                def _(j):
+                    r = r0 + i * h
+                    c = c0 + j * w
+                    src = regint.inc(h * w, 0, nc, 1, h) + \
+                        regint.inc(h * w, self.address + r * nc + c, 1, h)
+                    dest = regint.inc(h * w, 0, 1, 1, h) + \
+                        regint.inc(h * w, res.address + c * nr + r, nr, h)
+                    self.value_type.load_mem(src).store_in_mem(dest)
+        n_r, rest_r = divmod(nr, tile)
+        n_c, rest_c = divmod(nc, tile)
+        tiles(0, n_r, tile, 0, n_c, tile)
+        tiles(0, n_r, tile, n_c * tile, int(rest_c > 0), rest_c)
+        tiles(n_r * tile, int(rest_r > 0), rest_r, 0, n_c, tile)
+        tiles(n_r * tile, int(rest_r > 0), rest_r, n_c * tile,
+              int(rest_c > 0), rest_c)
+
     def trace(self):
         """ Matrix trace. """
         assert len(self.sizes) == 2
         assert self.sizes[0] == self.sizes[1]
-        return sum(self[i][i] for i in range(self.sizes[0]))
+        if issubclass(self.value_type, (sint, sfix)):
+            # one gather and one prefix sum, via the address because
+            # views have no backing array
+            n = self.sizes[0]
+            return self.value_type.load_mem(
+                self._inc(n, self.address, n + 1)).sum()
+        return util.tree_reduce(operator.add,
+                                [self[i][i] for i in range(self.sizes[0])])
 
     def diag(self):
         """ Matrix diagonal. """
         assert len(self.sizes) == 2
         assert self.sizes[0] == self.sizes[1]
         n = self.sizes[0]
-        return self.array.get(regint.inc(n, 0, n + 1))
+        return self.array.get(self._inc(n, 0, n + 1))
 
     def secure_shuffle(self):
         """ Securely shuffle rows (first index). This uses the algorithm in
@@ -7386,7 +8072,7 @@ class SubMultiArray(_vectorizable):
         <https://eprint.iacr.org/2014/137>`_ or Section 3.2 of
         `Asharov et al. <https://eprint.iacr.org/2022/1595>`_ if applicable.
         """
-        if self.total_size() < 2 ** 28:
+        if self._total_size < 2 ** 28:
             self.assign_vector(self.get_vector().secure_shuffle(self.part_size()))
         else:
             perm = sint.get_secure_shuffle(len(self))
@@ -7402,13 +8088,31 @@ class SubMultiArray(_vectorizable):
         :param n_threads: How many threads should be used. Will not multithread when set to None (default: None)
         :param n_parallel: How many columns should be permuted in parallel. Will use the compiler's optimization budget is set to None. (default: None).
         """
-        if (self.value_type == sint) and (n_threads is None):
+        vectorized = issubclass(self.value_type, (sint, sfix)) and \
+            n_threads is None
+        if vectorized and self._total_size < 2 ** 28:
             # Use only a single shuffle instruction if applicable and permutation is single-threaded anyway.
+            self.assign_vector(self.get_vector().secure_permute(
+                permutation, self.get_part_size(), reverse=reverse))
+        elif vectorized:
+            # as many columns per shuffle as a vector can hold
+            n_rows = self.sizes[0]
             unit_size = self.get_part_size()
-            n = self.sizes[0] * unit_size
-            res = sint(size=n)
-            applyshuffle(n, res, self[:], unit_size, permutation, reverse)
-            self.assign_vector(res)
+            def permute(start, width):
+                addresses = regint.inc(
+                    n_rows * width, self.address + start, unit_size, width) + \
+                    regint.inc(n_rows * width, 0, 1, 1, width)
+                self.value_type.load_mem(addresses).secure_permute(
+                    permutation, width, reverse=reverse).store_in_mem(
+                        addresses)
+            width = max(1, (2 ** 28 - 1) // n_rows)
+            n_blocks, rest = divmod(unit_size, width)
+            if n_blocks:
+                @library.for_range(n_blocks)
+                def _(i):
+                    permute(i * width, width)
+            if rest:
+                permute(n_blocks * width, rest)
         else:
             if n_threads is not None:
                 permutation = MemValue(permutation)
@@ -7462,7 +8166,7 @@ class SubMultiArray(_vectorizable):
           M.randomize(a, b)
 
         """
-        @library.multithread(n_threads, self.total_size(),
+        @library.multithread(n_threads, self._total_size,
                              max_size=program.budget)
         def _(base, size):
             self.assign_vector(
@@ -7481,22 +8185,23 @@ class SubMultiArray(_vectorizable):
 
     def reveal_nested(self):
         """ Reveal as nested list. """
-        flat = iter(self.get_vector().reveal())
-        res = []
-        def f(sizes):
-            if len(sizes) == 1:
-                return [next(flat) for i in range(sizes[0])]
+        flat = list(self.get_vector().reveal())
+        def f(depth, base):
+            if depth == len(self.sizes) - 1:
+                return flat[base:base + self.sizes[depth]]
             else:
-                return [f(sizes[1:]) for i in range(sizes[0])]
-        return f(self.sizes)
+                stride = self._strides[depth]
+                return [f(depth + 1, base + i * stride)
+                        for i in range(self.sizes[depth])]
+        return f(0, 0)
 
     def print_reveal_nested(self, end='\n'):
         """ Reveal and print as nested list.
 
         :param end: string to print after (default: line break)
         """
-        if util.is_constant(self.total_size()) and \
-           self.total_size() < program.budget:
+        if util.is_constant(self._total_size) and \
+           self._total_size < program.budget:
             library.print_str('%s' + end, self.reveal_nested())
         else:
             library.print_str('[')
@@ -7552,6 +8257,11 @@ class MultiArray(SubMultiArray):
     Arrays aren't initialized on creation, you need to call
     :py:func:`assign_all` to initialize them to a constant value.
 
+    Entries of types with several components such as
+    :py:class:`sfloat` are stored component by component within each
+    row of the last dimension. A row can therefore be accessed with
+    one vector access per component.
+
     """
     @staticmethod
     def disable_index_checks():
@@ -7616,6 +8326,14 @@ class Matrix(MultiArray):
             @library.for_range_opt(len(rows))
             def _(i):
                 res[i].assign(rows[i])
+        elif issubclass(t, (sint, sfix)) and \
+             all(isinstance(row, (list, tuple)) and
+                 len(row) == len(rows[0]) for row in rows) and \
+             all(type(x) == t for row in rows for x in row) and \
+             len(set((x.f, x.k) for row in rows for x in row
+                     if t == sfix)) < 2:
+            # one concatenation and one store instead of one per entry
+            res.assign_vector(t.concat(x for row in rows for x in row))
         else:
             for i in range(len(rows)):
                 res[i].assign(rows[i])
@@ -7626,8 +8344,11 @@ class Matrix(MultiArray):
 
     def get_column_by_row_indices(self, rows, column):
         assert self.value_type.n_elements() == 1
-        addresses = rows * self.sizes[1] + \
-            regint.inc(len(rows), self.address + column, 0)
+        base = self.address + column
+        if not util.is_constant(base):
+            base = regint.conv(base)
+        # constant offsets are added as an immediate vector
+        addresses = rows * self.sizes[1] + base
         return self.value_type.load_mem(addresses)
 
     def concat_columns(self, other):
@@ -7731,7 +8452,8 @@ class MemValue(_mem, _vectorizable):
     :param value: basic type or int (will be converted to regint)
 
     """
-    __slots__ = ['last_write_block', 'reg_type', 'register', 'address', 'deleted']
+    __slots__ = ['last_write_block', 'reg_type', 'register', 'address',
+                 'deleted', 'load_size', 'expand_cache']
 
     @classmethod
     def if_necessary(cls, value):
@@ -7742,6 +8464,7 @@ class MemValue(_mem, _vectorizable):
 
     def __init__(self, value, address=None, write=True):
         self.last_write_block = None
+        self.expand_cache = None
         if isinstance(value, MemValue):
             value = value.read()
         if isinstance(value, int):
@@ -7751,6 +8474,9 @@ class MemValue(_mem, _vectorizable):
             self.value_type = type(value)
         self.deleted = False
         self.size = value.size_for_mem()
+        from Compiler.GC.types import sbitvec
+        self.load_size = self.size \
+            if issubclass(self.value_type, (_register, sbitvec)) else None
         if address is None:
             self.address = self.value_type.malloc(self.size)
             if write:
@@ -7771,12 +8497,13 @@ class MemValue(_mem, _vectorizable):
 
         :return: relevant basic type instance """
         self.check()
-        if program.curr_block != self.last_write_block:
-            from Compiler.GC.types import sbitvec
+        # reading also counts as writing the register, so repeated
+        # reads in the same block share one load
+        block = program.curr_block
+        if block is not self.last_write_block:
             self.register = self.value_type.load_mem(
-                self.address, size=self.size \
-                if issubclass(self.value_type, (_register, sbitvec)) else None)
-            self.last_write_block = program.curr_block
+                self.address, size=self.load_size)
+            self.last_write_block = block
         return self.register
 
     def write(self, value):
@@ -7807,39 +8534,35 @@ class MemValue(_mem, _vectorizable):
         :return: relevant clear type """
         return self.read().reveal()
 
-    less_than = lambda self,other,bit_length=None: \
-        self.read().less_than(other,bit_length)
-    greater_than = lambda self,other,bit_length=None: \
-        self.read().greater_than(other,bit_length)
-    less_equal = lambda self,other,bit_length=None: \
-        self.read().less_equal(other,bit_length)
-    greater_equal = lambda self,other,bit_length=None: \
-        self.read().greater_equal(other,bit_length)
-    equal = lambda self,other,bit_length=None: \
-        self.read().equal(other,bit_length)
-    not_equal = lambda self,other,bit_length=None: \
-        self.read().not_equal(other,bit_length)
-
-    pow2 = lambda self,*args,**kwargs: self.read().pow2(*args, **kwargs)
-    mod2m = lambda self,*args,**kwargs: self.read().mod2m(*args, **kwargs)
-    right_shift = lambda self,*args,**kwargs: self.read().right_shift(*args, **kwargs)
-
-    bit_decompose = lambda self,*args,**kwargs: self.read().bit_decompose(*args, **kwargs)
+    read_forwarded = frozenset((
+        'less_than', 'greater_than', 'less_equal', 'greater_equal',
+        'equal', 'not_equal', 'mod2m', 'right_shift', 'bit_decompose',
+        'if_else', 'bit_and', 'bit_not', 'print_if'))
 
-    if_else = lambda self,*args,**kwargs: self.read().if_else(*args, **kwargs)
-    bit_and = lambda self,other: self.read().bit_and(other)
-    bit_not = lambda self: self.read().bit_not()
+    def __getattr__(self, name):
+        # only called if the attribute isn't found otherwise,
+        # return the method of the value so calls go there directly
+        if name in MemValue.read_forwarded:
+            return getattr(self.read(), name)
+        raise AttributeError('%s has no attribute %s' % (type(self), name))
 
-    print_if = lambda self,*args,**kwargs: self.read().print_if(*args, **kwargs)
+    # defined in _number, so it has to be overridden explicitly
+    pow2 = lambda self,*args,**kwargs: self.read().pow2(*args, **kwargs)
 
     def expand_to_vector(self, size=None):
-        if program.curr_block == self.last_write_block:
+        block = program.curr_block
+        if block is self.last_write_block:
             return self.read().expand_to_vector(size)
         else:
             if size is None:
                 size = get_global_vector_size()
-            addresses = regint.inc(size, self.address, 0)
-            return self.value_type.load_mem(addresses)
+            # writing in this block would take the branch above, so
+            # the last expansion stays valid for the rest of the block
+            key = block, size
+            if self.expand_cache is None or self.expand_cache[0] != key:
+                addresses = regint.inc(size, self.address, 0)
+                self.expand_cache = key, self.value_type.load_mem(addresses)
+            return self.expand_cache[1]
 
     shape = property(lambda self: ('mv', self.size))
 
@@ -7851,6 +8574,8 @@ class MemValue(_mem, _vectorizable):
 
 
 class MemFloat(MemValue):
+    __slots__ = []
+
     def __init__(self, *args):
         super().__init__(sfloat(*args))
 
@@ -7859,6 +8584,8 @@ class MemFloat(MemValue):
         super().write(value)
 
 class MemFix(MemValue):
+    __slots__ = []
+
     def __init__(self, *args):
         arg_type = type(*args)
         if arg_type == sfix:
@@ -7872,8 +8599,11 @@ class MemFix(MemValue):
     def write(self, *args):
         super().write(self.value_type(*args))
 
+@functools.lru_cache(maxsize=None)
 def getNamedTupleType(*names):
+    # one class per field list, the classes don't depend on anything else
     class NamedTuple(object):
+        __slots__ = names
         class NamedTupleArray(object):
             def __init__(self, size, t):
                 from . import types
@@ -7890,18 +8620,24 @@ def getNamedTupleType(*names):
             if len(args) == 1:
                 args = args[0]
             for name, value in zip(names, args):
-                self.__dict__[name] = value
+                setattr(self, name, value)
         def __iter__(self):
             for name in names:
-                yield self.__dict__[name]
+                yield getattr(self, name)
+        @classmethod
+        def _new(cls, values):
+            res = cls.__new__(cls)
+            for name, value in zip(names, values):
+                setattr(res, name, value)
+            return res
         def __add__(self, other):
-            return NamedTuple(i + j for i,j in zip(self, other))
+            return NamedTuple._new(map(operator.add, self, other))
         def __sub__(self, other):
-            return NamedTuple(i - j for i,j in zip(self, other))
+            return NamedTuple._new(map(operator.sub, self, other))
         def __xor__(self, other):
-            return NamedTuple(i ^ j for i,j in zip(self, other))
+            return NamedTuple._new(map(operator.xor, self, other))
         def __mul__(self, other):
-            return NamedTuple(other * i for i in self)
+            return NamedTuple._new(other * i for i in self)
         __rmul__ = __mul__
         __rxor__ = __xor__
         def reveal(self):
@@ -14,9 +14,9 @@ finish = int(sys.argv[4])
 
 client = Client(['localhost'] * n_parties, 14000, client_id)
 
+os = octetStream()
+os.store(finish)
 for socket in client.sockets:
-    os = octetStream()
-    os.store(finish)
     os.Send(socket)
 
 def run(x):
@@ -121,10 +121,10 @@ class Client:
         """
         T = self.domain
         triples = self.receive_triples(T, len(values))
-        os = octetStream()
         assert len(values) == len(triples)
-        for value, triple in zip(values, triples):
-            (T(value) + triple[0]).pack(os)
+        # serialize in one go instead of growing the buffer per value
+        os = octetStream(T.pack_many(int(round(value)) + triple[0].v
+                                     for value, triple in zip(values, triples)))
         for socket in self.sockets:
             os.Send(socket)
 
@@ -146,9 +146,7 @@ class Client:
         :param values: list of values
 
         """
-        os = octetStream()
-        for value in values:
-            self.domain(value).pack(os)
+        os = octetStream(self.domain.pack_many(values))
         for socket in self.sockets:
             os.Send(socket)
 
@@ -1,4 +1,5 @@
-import struct
+import array
+import sys
 
 class Domain:
     def __init__(self, value=0):
@@ -36,19 +37,17 @@ class Domain:
         return cls.n_bytes
 
     def unpack(self, os):
-        self.v = 0
-        buf = os.consume(self.n_bytes)
-        for i, b in enumerate(buf):
-            self.v += b << (i * 8)
+        self.v = int.from_bytes(os.consume(self.n_bytes), 'little')
+
+    def to_bytes(self):
+        return int(self.v).to_bytes(self.n_bytes, 'little')
 
     def pack(self, os):
-        v = self.v
-        temp_buf = []
-        for i in range(self.n_bytes):
-            temp_buf.append(v & 0xff)
-            v >>= 8
-        #Instead of using python a loop per value we let struct pack handle all it
-        os.buf += struct.pack('<{}B'.format(len(temp_buf)), *tuple(temp_buf))
+        os.buf += self.to_bytes()
+
+    @classmethod
+    def pack_many(cls, values):
+        return b''.join(cls(value).to_bytes() for value in values)
 
 def Z2(k):
     class Z(Domain):
@@ -56,6 +55,16 @@ def Z2(k):
         n_words = (k + 63) // 64
         n_bytes = (k + 7) // 8
 
+        if k == 64:
+            @classmethod
+            def pack_many(cls, values):
+                # one typed buffer instead of an object per value
+                res = array.array('Q', (int(round(value)) % cls.modulus
+                                        for value in values))
+                if sys.byteorder != 'little':
+                    res.byteswap()
+                return res.tobytes()
+
     return Z
 
 def Fp(mod):
@@ -72,7 +81,7 @@ def Fp(mod):
             Domain.unpack(self, os)
             self.v = self.v * self.R_inv % self.modulus
 
-        def pack(self, os):
-            Domain.pack(type(self)(self.v * self.R), os)
+        def to_bytes(self):
+            return Domain.to_bytes(type(self)(self.v * self.R))
 
     return Fp
@@ -9,16 +9,18 @@ try:
 except:
     pass
 
+no_input = 'noinput' in program.args
+
+# without actual input, default to a batch that amortizes the rounds
 try:
     batch_size = int(program.args[3])
 except:
-    batch_size = 1
+    batch_size = 8 if no_input else 1
 
 import torchvision
 import torch
 import numpy
-import requests
-import io
+import os
 import PIL
 
 from torchvision import transforms
@@ -26,18 +28,25 @@ from torchvision import transforms
 name =  'vgg' + program.args[1]
 model = getattr(torchvision.models, name)(weights='DEFAULT')
 
-r = requests.get('https://github.com/pytorch/hub/raw/master/images/dog.jpg')
-input_image = PIL.Image.open(io.BytesIO(r.content))
+# the weights are cached by torchvision, keep the image next to them
+image_file = os.path.join(torch.hub.get_dir(), 'dog.jpg')
+if not os.path.exists(image_file):
+    os.makedirs(torch.hub.get_dir(), exist_ok=True)
+    torch.hub.download_url_to_file(
+        'https://github.com/pytorch/hub/raw/master/images/dog.jpg', image_file)
+input_image = PIL.Image.open(image_file)
 input_tensor = transforms._presets.ImageClassification(crop_size=224)(input_image)
 input_batch = input_tensor.unsqueeze(0) # create a mini-batch as expected by the model
 
-with torch.no_grad():
-    output = int(model(input_batch).argmax())
-    print('Model says %d' % output)
+# plaintext reference result, only on request
+if 'ref' in program.args:
+    with torch.inference_mode():
+        output = int(model(input_batch).argmax())
+        print('Model says %d' % output)
 
-input_reshaped = numpy.moveaxis(input_batch.numpy(), 1, -1)
-
-no_input = 'noinput' in program.args
+# contiguous in the new order, so that it can be written out directly
+input_reshaped = numpy.ascontiguousarray(
+    numpy.moveaxis(input_batch.numpy(), 1, -1))
 
 if no_input:
     secret_input = sfix.Tensor([batch_size] + list(input_reshaped.shape[1:]))
@@ -48,7 +57,12 @@ else:
 layers = ml.layers_from_torch(model, secret_input.shape, batch_size,
                               input_via=None if no_input else 0)
 
-optimizer = ml.Optimizer(layers, time_layers=True)
+# the layers hold their own copies, free the plaintext model before compiling
+del model, input_tensor, input_batch, input_reshaped
+import gc
+gc.collect()
+
+optimizer = ml.Optimizer(layers, time_layers='time_layers' in program.args)
 
 start_timer(1)
 print_ln('Secure computation says %s',